@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import os
+import metrics
+from quart import Quart, Response, g, request, jsonify
+from chatbot import answer_query_async, groq_keepalive_async
+from groq_scheduler import SchedulerOverloaded, request_channel
+from conversations import conversation_store
+from hotel_server import HOME_TEXT, begin_request, end_request, load_channels, server_stats
+from hotel_server.config import CHANNELS
+from hotel_server.web import BUSY_ERROR, MISSING_QUERY_ERROR, UNCLASSIFIED_ERROR
+
+# Async serving mode: `hypercorn asgi:app` serves /query and /twilio_webhook without
+# tying up a worker thread per in-flight LLM call. Hooks, /stats, error bodies and the
+# WhatsApp replies come from the hotel_server package, so both serving modes stay alike.
+app = Quart(__name__)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "2000"))
+QUEUE_TIMEOUT = float(os.getenv("ASYNC_QUEUE_TIMEOUT", "5"))
+REQUEST_TIMEOUT = float(os.getenv("ASYNC_REQUEST_TIMEOUT", "30"))
+
+llm_slots = asyncio.Semaphore(MAX_CONCURRENCY)
+keepalive_task = None
+channel_modules = load_channels(CHANNELS)
+
+
+# Open Groq connections before the first guest arrives and keep them alive while serving
+@app.before_serving
+async def start_keepalive():
+    global keepalive_task
+    keepalive_task = asyncio.create_task(groq_keepalive_async())
+
+@app.after_serving
+async def stop_keepalive():
+    if keepalive_task is not None:
+        keepalive_task.cancel()
+
+@app.before_request
+async def start_request():
+    g.request_start = begin_request(request.path, request.headers)
+
+@app.after_request
+async def finish_request(response):
+    return end_request(request.url_rule, response, g.request_start)
+
+
+class Overloaded(Exception):
+    pass
+
+
+# Run the answer pipeline within the concurrency bound and the per-request timeout.
+# Quart cancels the handler task when the client disconnects, which cancels the
+# in-flight Groq request along with it.
+async def answer_bounded(query, history=()):
+    try:
+        await asyncio.wait_for(llm_slots.acquire(), QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise Overloaded()
+    try:
+        return await asyncio.wait_for(answer_query_async(query, history=history), REQUEST_TIMEOUT)
+    except SchedulerOverloaded:
+        raise Overloaded()
+    except asyncio.CancelledError:
+        logger.info(f"Client disconnected, cancelled query: {query}")
+        raise
+    finally:
+        llm_slots.release()
+
+async def handle_query():
+    query = request.args.get('query')
+    if not query:
+        return jsonify(MISSING_QUERY_ERROR), 400
+
+    try:
+        response = await answer_bounded(query)
+    except Overloaded:
+        return jsonify(BUSY_ERROR), 503
+    except asyncio.TimeoutError:
+        return jsonify({"error": "Timed out generating a response"}), 504
+    if response is None:
+        return jsonify(UNCLASSIFIED_ERROR), 500
+
+    return jsonify({"response": response})
+
+@app.route('/stats', methods=['GET'])
+async def stats():
+    return jsonify(server_stats(CHANNELS, channel_modules))
+
+@app.route('/metrics', methods=['GET'])
+async def metrics_endpoint():
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+# Answer a WhatsApp message within the same bounds as /query
+async def whatsapp_reply_async(message_body, phone_number):
+    try:
+        with request_channel("whatsapp"):
+            response_text = await answer_bounded(message_body, conversation_store.messages(phone_number))
+    except (Overloaded, asyncio.TimeoutError):
+        return BUSY_REPLY
+    return finish_reply(message_body, phone_number, response_text)
+
+# Honours WHATSAPP_REPLY_MODE like the Flask webhook: in async mode acknowledge right away
+# and let the delivery workers send the reply
+async def render_webhook_reply_async(phone_number, message_body, reply_from):
+    if REPLY_MODE == "async" and delivery_queue.submit(phone_number, message_body, reply_from):
+        return twiml_message()
+    return twiml_message(await whatsapp_reply_async(message_body, phone_number))
+
+# Twilio webhook for handling WhatsApp messages
+async def twilio_webhook():
+    form = await request.form
+    phone_number = form.get('From')
+    message_body = form.get('Body')
+
+    if not phone_number or not message_body:
+        return MISSING_FIELDS_TWIML, 400, XML_HEADERS
+
+    logger.info(f"Received WhatsApp message from {phone_number}: {message_body}")
+
+    # Twilio retries slow webhooks with the same MessageSid; answer each message only once
+    reply_from = form.get('To')
+    twiml = await webhook_dedup.run_async(form.get('MessageSid'),
+                                          lambda: render_webhook_reply_async(phone_number, message_body, reply_from))
+
+    return twiml, 200, XML_HEADERS
+
+# Same SERVE_CHANNELS toggles as the Flask app
+if "web" in CHANNELS:
+    app.add_url_rule('/query', view_func=handle_query, methods=['GET'])
+if "whatsapp" in CHANNELS:
+    # Shares the dedup store, delivery queue and replies with the Flask webhook
+    from hotel_server.whatsapp import (BUSY_REPLY, MISSING_FIELDS_TWIML, XML_HEADERS, delivery_queue,
+                                       finish_reply, twiml_message, webhook_dedup)
+    from whatsapp_delivery import REPLY_MODE
+    app.add_url_rule('/twilio_webhook', view_func=twilio_webhook, methods=['POST'])
+
+@app.route('/')
+async def home():
+    return HOME_TEXT
@@ -0,0 +1,295 @@
+import bisect
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Free rooms are listed by name up to this many, and grouped by description beyond it
+MAX_LISTED_ROOMS = int(os.getenv("AVAILABILITY_MAX_LISTED_ROOMS", "10"))
+
+# Bookings are half-open [check_in, check_out) ranges of ISO dates: a stay from the 14th
+# to the 16th books the nights of the 14th and 15th, and the room is free again on the 16th
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_id INTEGER NOT NULL REFERENCES rooms(id),
+    check_in TEXT NOT NULL,
+    check_out TEXT NOT NULL,
+    guest TEXT,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CHECK (check_in < check_out)
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_room_dates ON bookings (room_id, check_out, check_in);
+CREATE INDEX IF NOT EXISTS idx_bookings_check_out ON bookings (check_out);
+"""
+ROOMS_SQL = "SELECT id, description FROM rooms ORDER BY id"
+# Stays that ended before today can never conflict with a new one
+BOOKINGS_SQL = "SELECT room_id, check_in, check_out FROM bookings WHERE check_out > ?"
+
+MONTH_NAMES = ["january", "february", "march", "april", "may", "june", "july",
+               "august", "september", "october", "november", "december"]
+MONTHS = {name[:3]: number for number, name in enumerate(MONTH_NAMES, 1)}
+MONTH = (r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+         r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+DAY = r"(\d{1,2})(?:st|nd|rd|th)?"
+YEAR = r"(?:,?\s*(\d{4}))?"
+RANGE = r"\s*(?:-|–|to|till|until|through)\s*"
+NUMBER_WORDS = {"a": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+                "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+RELATIVE_DAYS = {"today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2}
+
+# Date mentions, most specific first; a later pattern never matches inside an earlier match
+DATE_PATTERNS = [
+    ("iso", re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")),
+    ("month_range", re.compile(rf"\b{MONTH}\s*{DAY}{RANGE}{DAY}\b{YEAR}")),
+    ("range_month", re.compile(rf"\b{DAY}{RANGE}{DAY}\s+(?:of\s+)?{MONTH}{YEAR}")),
+    ("day_month", re.compile(rf"\b{DAY}\s+(?:of\s+)?{MONTH}{YEAR}")),
+    ("month_day", re.compile(rf"\b{MONTH}\s*{DAY}\b{YEAR}")),
+    ("numeric", re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?\b")),
+    ("relative", re.compile(r"\b(day after tomorrow|tomorrow|today|tonight)\b")),
+    ("ordinal", re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)\b(?!\s*(?:floor|guest|person|people|night|time|room))")),
+]
+# A bare d/m is only read as a date with a cue: a preposition right before it, another d/m
+# right after it, or a stay verb anywhere in the query. "24/7" is never a date.
+NUMERIC_CUE_BEFORE = re.compile(r"(?:\b(?:on|from|for|until|till|to|between|and|by|before|after)|-|–)\s*$")
+NUMERIC_CUE_AFTER = re.compile(rf"^{RANGE}\d{{1,2}}/\d{{1,2}}\b")
+STAY_VERBS = re.compile(r"\b(?:book\w*|reserv\w*|stay\w*|check(?:ing)?[\s-]?(?:in|out)|arriv\w*|leav\w*"
+                        r"|nights?|vacan\w*|availability)\b")
+NIGHTS = re.compile(rf"\b(\d{{1,2}}|{'|'.join(NUMBER_WORDS)})\s+(nights?|weeks?)\b")
+
+
+def _year(text):
+    if not text:
+        return None
+    return 2000 + int(text) if len(text) == 2 else int(text)
+
+
+def _numeric_date(text, match):
+    if match.group(0) == "24/7":
+        return False
+    return bool(NUMERIC_CUE_BEFORE.search(text[:match.start()]) or NUMERIC_CUE_AFTER.search(text[match.end():])
+                or STAY_VERBS.search(text))
+
+
+# (year, month, day) parts of each date mentioned, in the order they appear; a missing
+# year or month is None, and relative days are resolved straight away
+def _mentions(text, today):
+    found = []
+    for kind, pattern in DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            if any(match.start() < end and start < match.end() for start, end, _ in found):
+                continue
+            g = match.groups()
+            if kind == "numeric" and g[2] is None and not _numeric_date(text, match):
+                continue
+            if kind == "iso":
+                parts = [(int(g[0]), int(g[1]), int(g[2]))]
+            elif kind == "month_range":
+                month, year = MONTHS[g[0][:3]], _year(g[3])
+                parts = [(year, month, int(g[1])), (year, month, int(g[2]))]
+            elif kind == "range_month":
+                month, year = MONTHS[g[2][:3]], _year(g[3])
+                parts = [(year, month, int(g[0])), (year, month, int(g[1]))]
+            elif kind == "day_month":
+                parts = [(_year(g[2]), MONTHS[g[1][:3]], int(g[0]))]
+            elif kind == "month_day":
+                parts = [(_year(g[2]), MONTHS[g[0][:3]], int(g[1]))]
+            elif kind == "numeric":
+                parts = [(_year(g[2]), int(g[1]), int(g[0]))]
+            elif kind == "relative":
+                day = today + timedelta(days=RELATIVE_DAYS[g[0]])
+                parts = [(day.year, day.month, day.day)]
+            else:
+                parts = [(None, None, int(g[0]))]
+            found.append((match.start(), match.end(), parts))
+    found.sort()
+    return [part for _, _, parts in found for part in parts]
+
+
+# The next valid date on or after `anchor` matching the known parts. A bare day ("the
+# 14th") takes the month of the next mention that has one ("14th to 16th March").
+def _resolve(mentions, today):
+    dates, anchor = [], today
+    for i, (year, month, day) in enumerate(mentions):
+        if month is None:
+            month = next((m for _, m, _ in mentions[i + 1:] if m is not None), None)
+        if year is not None and month is not None:
+            candidates = [(year, month)]
+        elif month is not None:
+            candidates = [(anchor.year, month), (anchor.year + 1, month)]
+        else:
+            candidates = [(anchor.year + (anchor.month + k - 1) // 12, (anchor.month + k - 1) % 12 + 1)
+                          for k in range(3)]
+        for y, m in candidates:
+            try:
+                resolved = date(y, m, day)
+            except ValueError:
+                continue
+            if year is not None or resolved >= anchor:
+                dates.append(resolved)
+                anchor = resolved
+                break
+    return dates
+
+
+# (check_in, check_out) dates of the stay a guest asks about, or None when the query
+# mentions no dates. One date means one night unless a number of nights is given.
+def parse_stay(query, today=None):
+    today = today or date.today()
+    text = query.lower()
+    dates = _resolve(_mentions(text, today), today)
+    if not dates:
+        return None
+    check_in = dates[0]
+    later = [d for d in dates[1:] if d > check_in]
+    if later:
+        return check_in, later[0]
+    nights = 1
+    match = NIGHTS.search(text)
+    if match:
+        count = NUMBER_WORDS.get(match.group(1)) or int(match.group(1))
+        nights = count * 7 if match.group(2).startswith("week") else count
+    return check_in, check_in + timedelta(days=max(nights, 1))
+
+
+# Creates the bookings table and gives rooms the version column that reservations.py
+# uses for optimistic locking
+def ensure_schema(path):
+    try:
+        conn = sqlite3.connect(path)
+        try:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(rooms)")}
+            if columns and "version" not in columns:
+                conn.execute("ALTER TABLE rooms ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+                conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not create the bookings table in {path}: {e}")
+
+
+# Booked nights of one room as sorted, disjoint [start, end) ranges of date ordinals.
+# Overlapping and back-to-back bookings are merged, so both lists stay sorted and an
+# overlap check is one bisect.
+class RoomCalendar:
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges=()):
+        self.starts, self.ends = [], []
+        for start, end in sorted(ranges):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def is_free(self, start, end):
+        i = bisect.bisect_right(self.ends, start)
+        return i == len(self.starts) or self.starts[i] >= end
+
+    # First day on or after `start` from which the room is free for `nights` nights
+    def next_free(self, start, nights):
+        i = bisect.bisect_right(self.ends, start)
+        while i < len(self.starts) and self.starts[i] < start + nights:
+            start = max(start, self.ends[i])
+            i += 1
+        return start
+
+
+def format_day(day):
+    return f"{day:%a %d %b %Y}"
+
+
+# In-memory per-room calendars built from the rooms and bookings tables. RoomContextStore
+# calls reload whenever rooms.db changes; lookups then never touch the database.
+class AvailabilityIndex:
+    def __init__(self, path, max_listed=MAX_LISTED_ROOMS):
+        self.path = path
+        self.max_listed = max_listed
+        self._rooms = []
+        self._schema_checked = False
+        self._lock = threading.Lock()
+        self._stats = {"rooms": 0, "bookings": 0, "reloads": 0, "reload_ms": 0.0, "lookups": 0}
+
+    def reload(self, conn, today=None):
+        if not self._schema_checked:
+            ensure_schema(self.path)
+            self._schema_checked = True
+        start = time.perf_counter()
+        today = today or date.today()
+        try:
+            rooms = conn.execute(ROOMS_SQL).fetchall()
+            ranges = {}
+            count = 0
+            for room_id, check_in, check_out in conn.execute(BOOKINGS_SQL, (today.isoformat(),)):
+                ranges.setdefault(room_id, []).append(
+                    (date.fromisoformat(check_in).toordinal(), date.fromisoformat(check_out).toordinal()))
+                count += 1
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Could not load bookings: {e}")
+            return False
+        self._rooms = [(room_id, description or f"Room {room_id}", RoomCalendar(ranges.get(room_id, ())))
+                       for room_id, description in rooms]
+        with self._lock:
+            self._stats.update(rooms=len(rooms), bookings=count,
+                               reload_ms=round((time.perf_counter() - start) * 1000, 1))
+            self._stats["reloads"] += 1
+        return True
+
+    # (free, booked) lists of (room_id, description, calendar) for the stay
+    def lookup(self, check_in, check_out):
+        start, end = check_in.toordinal(), check_out.toordinal()
+        free, booked = [], []
+        for room in self._rooms:
+            (free if room[2].is_free(start, end) else booked).append(room)
+        with self._lock:
+            self._stats["lookups"] += 1
+        return free, booked
+
+    def _names(self, rooms):
+        if len(rooms) <= self.max_listed:
+            return ", ".join(description for _, description, _ in rooms)
+        groups = Counter(description for _, description, _ in rooms).most_common()
+        names = [f"{description} ({count})" for description, count in groups[:self.max_listed]]
+        if len(groups) > self.max_listed:
+            names.append(f"{len(groups) - self.max_listed} more room types")
+        return ", ".join(names)
+
+    # Availability for the dates the guest mentions, as context for the LLM; None when
+    # the query has no dates or there is no room inventory
+    def context(self, query, today=None):
+        today = today or date.today()
+        stay = parse_stay(query, today)
+        if stay is None or not self._rooms:
+            return None
+        check_in, check_out = stay
+        nights = (check_out - check_in).days
+        header = f"Availability from {format_day(check_in)} to {format_day(check_out)} ({nights} night{'s' if nights != 1 else ''})"
+        if check_in < today:
+            return f"{header}: these dates are in the past."
+        free, booked = self.lookup(check_in, check_out)
+        lines = [f"{header}: {len(free)} of {len(self._rooms)} rooms free."]
+        if free:
+            lines.append(f"Free: {self._names(free)}")
+        if booked and len(booked) <= self.max_listed:
+            start = check_in.toordinal()
+            lines.append("Booked: " + ", ".join(
+                f"{description} (free for {nights} night{'s' if nights != 1 else ''} from "
+                f"{format_day(date.fromordinal(calendar.next_free(start, nights)))})"
+                for _, description, calendar in booked))
+        elif not free:
+            _, description, calendar = min(booked, key=lambda room: room[2].next_free(check_in.toordinal(), nights))
+            earliest = date.fromordinal(calendar.next_free(check_in.toordinal(), nights))
+            lines.append(f"Earliest free: {description} from {format_day(earliest)}")
+        return "\n".join(lines)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,111 @@
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from availability import SCHEMA, AvailabilityIndex, ensure_schema
+
+ROOM_TYPES = ["Ocean View Deluxe", "Garden Cottage", "Family Suite", "Heritage Room", "Pool Villa"]
+# SQL equivalent of AvailabilityIndex.lookup, answered from idx_bookings_room_dates
+FREE_ROOMS_SQL = """
+SELECT id FROM rooms WHERE NOT EXISTS (
+    SELECT 1 FROM bookings WHERE room_id = rooms.id AND check_in < ? AND check_out > ?
+) ORDER BY id
+"""
+
+
+# Back-to-back stays of 1-7 nights with gaps of 0-4 days for every room, from `years`
+# ago until a year from today (roughly 75 % occupancy)
+def synthetic_bookings(path, rooms, years, today, seed=7):
+    rng = random.Random(seed)
+    ensure_schema(path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executescript("CREATE TABLE IF NOT EXISTS rooms (id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL);")
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT INTO rooms (description) VALUES (?)",
+                         [(rng.choice(ROOM_TYPES),) for _ in range(rooms)])
+        rows = []
+        first, last = today - timedelta(days=365 * years), today + timedelta(days=365)
+        for room_id in range(1, rooms + 1):
+            day = first + timedelta(days=rng.randint(0, 6))
+            while day < last:
+                nights = rng.randint(1, 7)
+                rows.append((room_id, day.isoformat(), (day + timedelta(days=nights)).isoformat(), "guest"))
+                day += timedelta(days=nights + rng.choice([0, 0, 0, 1, 2, 4]))
+        conn.executemany("INSERT INTO bookings (room_id, check_in, check_out, guest) VALUES (?, ?, ?, ?)", rows)
+    conn.close()
+    return len(rows)
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return statistics.median(timings), timings[int(len(timings) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Room availability lookups: indexed SQLite vs in-memory calendars")
+    parser.add_argument("--rooms", type=int, default=300)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    today = date.today()
+    rng = random.Random(1)
+    stays = []
+    for _ in range(args.lookups):
+        check_in = today + timedelta(days=rng.randint(0, 360))
+        stays.append((check_in, check_in + timedelta(days=rng.randint(1, 7))))
+    queries = [f"Is a room free from {a:%d %B %Y} to {b:%d %B %Y}?" for a, b in stays[:200]]
+
+    with tempfile.TemporaryDirectory(prefix="bench-availability-") as workdir:
+        path = os.path.join(workdir, "rooms.db")
+        count = synthetic_bookings(path, args.rooms, args.years, today)
+        print(f"{args.rooms} rooms, {count} bookings over {args.years + 1} years")
+
+        conn = sqlite3.connect(path)
+        sql_results, timings = [], []
+        for check_in, check_out in stays:
+            start = time.perf_counter()
+            sql_results.append([row[0] for row in conn.execute(FREE_ROOMS_SQL, (check_out.isoformat(), check_in.isoformat()))])
+            timings.append((time.perf_counter() - start) * 1000)
+        p50, p99 = percentiles(timings)
+        print(f"{'SQLite (indexed)':<24} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+        index = AvailabilityIndex(path)
+        reloads = []
+        for _ in range(5):
+            start = time.perf_counter()
+            index.reload(conn, today)
+            reloads.append((time.perf_counter() - start) * 1000)
+        stats = index.stats()
+        print(f"{'in-memory reload':<24} {statistics.median(reloads):7.1f} ms for {stats['bookings']} current bookings")
+
+        memory_results, timings = [], []
+        for check_in, check_out in stays:
+            start = time.perf_counter()
+            free, _ = index.lookup(check_in, check_out)
+            timings.append((time.perf_counter() - start) * 1000)
+            memory_results.append([room_id for room_id, _, _ in free])
+        p50, p99 = percentiles(timings)
+        print(f"{'in-memory calendars':<24} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.context(query, today)
+            timings.append((time.perf_counter() - start) * 1000)
+        p50, p99 = percentiles(timings)
+        print(f"{'query -> context':<24} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms  (date parsing + lookup + text)")
+        conn.close()
+
+    mismatches = sum(a != b for a, b in zip(sql_results, memory_results))
+    print(f"results identical to SQLite for {len(stays) - mismatches}/{len(stays)} stays")
+
+
+if __name__ == "__main__":
+    main()
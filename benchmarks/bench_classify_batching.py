@@ -0,0 +1,86 @@
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+
+from benchmarks.mock_groq import MockGroqServer
+
+QUERIES = [
+    "Do you have something for the long weekend?",
+    "What's the story with the sea here?",
+    "Can my parents come along in December?",
+    "Anything fun for kids?",
+    "What about the 14th?",
+    "Is it quiet at night?",
+]
+
+
+def run(chatbot, server, batcher, rate, duration, seed=1):
+    chatbot.classify_batcher = batcher
+    server.reset_stats()
+    rng = random.Random(seed)
+    latencies, threads = [], []
+    lock = threading.Lock()
+
+    def one(query):
+        start = time.perf_counter()
+        chatbot.classify_query(query)
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    next_arrival = start
+    while next_arrival - start < duration:
+        time.sleep(max(0.0, next_arrival - time.perf_counter()))
+        thread = threading.Thread(target=one, args=(rng.choice(QUERIES),))
+        thread.start()
+        threads.append(thread)
+        next_arrival += rng.expovariate(rate)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "calls_per_query": server.snapshot()["requests"] / len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency of micro-batched classification")
+    parser.add_argument("--rates", type=float, nargs="+", default=[10, 50, 100, 200], help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--window-ms", type=float, default=20.0)
+    parser.add_argument("--max-size", type=int, default=16)
+    args = parser.parse_args()
+
+    server = MockGroqServer(ttft_ms=150, per_token_ms=2).start()
+    os.environ["GROQ_BASE_URL"] = server.base_url
+    os.environ.setdefault("GROQ_API_KEY", "mock-key")
+    os.environ["GROQ_PREWARM_CONNECTIONS"] = "0"
+    os.environ["GROQ_LOG_TIMINGS"] = "0"
+    # Every query goes to the LLM so the batcher sees the full arrival rate
+    os.environ["CLASSIFIER_CONFIDENCE_THRESHOLD"] = "1.01"
+    import logging
+    logging.disable(logging.INFO)
+    import chatbot
+    from classify_batcher import ClassificationBatcher
+
+    batcher = ClassificationBatcher(chatbot.send_classification_batch, args.window_ms, args.max_size)
+    print(f"{'rate/s':>7} {'mode':>9} {'done/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'calls/query':>12}")
+    try:
+        for rate in args.rates:
+            for name, mode in (("single", None), ("batched", batcher)):
+                r = run(chatbot, server, mode, rate, args.duration)
+                print(f"{rate:>7.0f} {name:>9} {r['throughput']:>8.1f} {r['p50']:>8.1f} "
+                      f"{r['p95']:>8.1f} {r['calls_per_query']:>12.2f}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
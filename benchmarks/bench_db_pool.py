@@ -0,0 +1,67 @@
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from db_pool import ConnectionPool
+
+ROOM_DETAILS_SQL = "SELECT title, description FROM room_data"
+
+
+# The original read path: a fresh connection per request
+def fetch_with_new_connection(path):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute(ROOM_DETAILS_SQL)
+    results = cursor.fetchall()
+    conn.close()
+    return results
+
+
+def fetch_with_pool(pool):
+    with pool.connection() as conn:
+        return conn.execute(ROOM_DETAILS_SQL).fetchall()
+
+
+def measure(fetch, workers, duration):
+    stop = time.perf_counter() + duration
+    counts = [0] * workers
+
+    def worker(index):
+        while time.perf_counter() < stop:
+            fetch()
+            counts[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Room detail reads/sec with and without the pool")
+    parser.add_argument("--db", default="rooms.db")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    # Work on a copy so the benchmark never touches the live database
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rooms.db")
+        shutil.copy(args.db, path)
+        print(f"{'workers':>8} {'per-request conn/s':>20} {'pooled/s':>12} {'speedup':>8}")
+        for workers in args.workers:
+            pool = ConnectionPool(path, size=workers)
+            before = measure(lambda: fetch_with_new_connection(path), workers, args.duration)
+            after = measure(lambda: fetch_with_pool(pool), workers, args.duration)
+            pool.close()
+            print(f"{workers:>8} {before:>20.0f} {after:>12.0f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
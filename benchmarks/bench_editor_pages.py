@@ -0,0 +1,89 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from benchmarks.suite import ROOT
+from room_catalog import ensure_schema
+
+ALL_ROOMS_SQL = "SELECT title, description FROM room_data"
+OFFSET_SQL = "SELECT id, title, description FROM room_data ORDER BY id LIMIT ? OFFSET ?"
+KEYSET_SQL = "SELECT id, title, description FROM room_data WHERE id > ? ORDER BY id LIMIT ?"
+
+
+def create_db(path, rooms):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE room_data (title TEXT, description TEXT)")
+        conn.executemany("INSERT INTO room_data VALUES (?, ?)",
+                         [(f"Room {i}", f"{'Ocean' if i % 3 else 'Garden'} view room {i} with a king bed and balcony.")
+                          for i in range(1, rooms + 1)])
+    conn.close()
+    ensure_schema(path)
+
+
+def median_ms(fn, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+# Script reruns of data.py through Streamlit's AppTest: the first load and a click on Next
+def rerun_ms(workdir, rooms):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    # The cached connection of the previous catalog would otherwise be reused
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        app = AppTest.from_file(os.path.join(ROOT, "data.py"), default_timeout=60)
+        start = time.perf_counter()
+        app.run()
+        first = (time.perf_counter() - start) * 1000
+        assert app.caption[0].value.endswith(f"of {rooms}"), app.caption[0].value
+        timings = []
+        for _ in range(10):
+            next_button = next(button for button in app.button if button.label.startswith("Next"))
+            start = time.perf_counter()
+            next_button.click().run()
+            timings.append((time.perf_counter() - start) * 1000)
+        return first, statistics.median(timings)
+    finally:
+        os.chdir(cwd)
+
+
+# Per-interaction cost of the room editor as the catalog grows: the old full-table read,
+# a deep page by OFFSET and by keyset, and whole reruns of data.py
+def main():
+    parser = argparse.ArgumentParser(description="Room editor page loads vs catalog size")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--no-app", action="store_true", help="skip the Streamlit rerun timings")
+    args = parser.parse_args()
+
+    print(f"{'rooms':>8} {'read all ms':>12} {'offset last page':>17} {'keyset last page':>17} "
+          f"{'first load ms':>14} {'next page ms':>13}")
+    for rooms in args.rooms:
+        with tempfile.TemporaryDirectory(prefix="bench-editor-pages-") as workdir:
+            path = os.path.join(workdir, "rooms.db")
+            create_db(path, rooms)
+            conn = sqlite3.connect(path)
+            last_id = conn.execute("SELECT MAX(id) FROM room_data").fetchone()[0]
+            read_all = median_ms(lambda: conn.execute(ALL_ROOMS_SQL).fetchall(), repeat=5)
+            offset = median_ms(lambda: conn.execute(OFFSET_SQL, (args.page_size, rooms - args.page_size)).fetchall())
+            keyset = median_ms(lambda: conn.execute(KEYSET_SQL, (last_id - args.page_size, args.page_size)).fetchall())
+            conn.close()
+            first, next_page = (None, None) if args.no_app else rerun_ms(workdir, rooms)
+        app = f"{first:>14.1f} {next_page:>13.1f}" if first is not None else f"{'-':>14} {'-':>13}"
+        print(f"{rooms:>8} {read_all:>12.2f} {offset:>17.3f} {keyset:>17.3f} {app}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from db_pool import ConnectionPool
+from room_catalog import ensure_schema, save_rooms
+from room_store import RoomContextStore
+
+READ_SQL = "SELECT title, description FROM room_data WHERE rowid = ?"
+# A read slower than this counts as stalled
+STALL_MS = 5.0
+
+
+def create_db(path, rooms, journal_mode):
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    with conn:
+        conn.execute("CREATE TABLE room_data (title TEXT, description TEXT)")
+        conn.executemany("INSERT INTO room_data VALUES (?, ?)",
+                         [(f"Room {i}", f"Sea-facing room {i} with a king bed and balcony. " * 4) for i in range(rooms)])
+    conn.close()
+
+
+# The editor's old Save: pandas to_sql(if_exists="replace") drops and recreates the table
+def save_drop_and_recreate(path, rows):
+    conn = sqlite3.connect(path, timeout=30)
+    with conn:
+        conn.execute("DROP TABLE room_data")
+        conn.execute("CREATE TABLE room_data (title TEXT, description TEXT)")
+        conn.executemany("INSERT INTO room_data VALUES (?, ?)", [(title, desc) for _, title, desc in rows])
+    conn.close()
+
+
+# The Save after pandas was removed: every row deleted and re-inserted
+def save_delete_and_insert(path, rows):
+    conn = sqlite3.connect(path, timeout=30)
+    with conn:
+        conn.execute("DELETE FROM room_data")
+        conn.executemany("INSERT INTO room_data VALUES (?, ?)", [(title, desc) for _, title, desc in rows])
+    conn.close()
+
+
+def save_upsert(path, rows, edited):
+    save_rooms(path, [edited])
+
+
+# Point reads on a read-only connection, like the chat servers' pool, timed one by one.
+# Readers are processes so the editor's Python work does not show up as GIL waits.
+def reader(path, rooms, stop, results):
+    conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+    rng = random.Random()
+    latencies, errors = [], 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            conn.execute(READ_SQL, (rng.randint(1, rooms),)).fetchall()
+        except sqlite3.OperationalError:
+            errors += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    results.put((latencies, errors))
+
+
+def run(mode, args):
+    with tempfile.TemporaryDirectory(prefix="bench-editor-") as workdir:
+        path = os.path.join(workdir, "rooms.db")
+        create_db(path, args.rooms, "delete" if mode == "drop_recreate" else "wal")
+        if mode == "upsert":
+            ensure_schema(path)
+        pool = ConnectionPool(path, size=2)
+        store = RoomContextStore(pool, interval=3600)
+        # The old chat servers had no change log and rebuilt everything after a commit
+        store._schema_checked = mode != "upsert"
+        store.refresh()
+
+        conn = sqlite3.connect(path)
+        rows = [tuple(row) for row in conn.execute("SELECT rowid, title, description FROM room_data")]
+        conn.close()
+
+        stop, results = multiprocessing.Event(), multiprocessing.Queue()
+        readers = [multiprocessing.Process(target=reader, args=(path, args.rooms, stop, results))
+                   for _ in range(args.readers)]
+        for process in readers:
+            process.start()
+        time.sleep(0.2)
+        rng = random.Random(1)
+        saves, refreshes = [], []
+        for i in range(args.saves):
+            index = rng.randrange(len(rows))
+            room_id, title, desc = rows[index]
+            rows[index] = (room_id, title, f"{desc} Edited {i}.")
+            start = time.perf_counter()
+            if mode == "drop_recreate":
+                save_drop_and_recreate(path, rows)
+            elif mode == "delete_insert":
+                save_delete_and_insert(path, rows)
+            else:
+                save_upsert(path, rows, rows[index])
+            saves.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            store.refresh()
+            refreshes.append((time.perf_counter() - start) * 1000)
+            time.sleep(args.interval)
+        stop.set()
+        latencies, errors = [], 0
+        for _ in readers:
+            reader_latencies, reader_errors = results.get()
+            latencies += reader_latencies
+            errors += reader_errors
+        for process in readers:
+            process.join()
+        pool.close()
+
+    latencies.sort()
+    return {
+        "save_ms": statistics.median(saves),
+        "refresh_ms": statistics.median(refreshes),
+        "read_p99_ms": latencies[int(len(latencies) * 0.99)],
+        "read_max_ms": latencies[-1],
+        "stalled_ms": sum(ms for ms in latencies if ms > STALL_MS),
+        "errors": errors,
+        "reloaded": store.stats()["rooms_reloaded"],
+    }
+
+
+# Reader latency and chat-server refresh cost while the editor saves one edited room at
+# a time, for the old whole-table saves and the row-level upsert path
+def main():
+    parser = argparse.ArgumentParser(description="Reader stalls during room editor saves")
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--saves", type=int, default=30)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between saves")
+    args = parser.parse_args()
+
+    print(f"{args.rooms} rooms, {args.saves} saves of one edited room, {args.readers} reader processes")
+    print(f"{'save path':<28} {'save ms':>8} {'refresh ms':>11} {'read p99':>9} {'read max':>9} "
+          f"{'stalled ms':>11} {'errors':>7} {'rows reloaded':>14}")
+    for mode, label in [("drop_recreate", "to_sql replace, rollback"), ("delete_insert", "delete+insert, WAL"),
+                        ("upsert", "row upsert, WAL")]:
+        r = run(mode, args)
+        print(f"{label:<28} {r['save_ms']:>8.2f} {r['refresh_ms']:>11.2f} {r['read_p99_ms']:>9.3f} "
+              f"{r['read_max_ms']:>9.2f} {r['stalled_ms']:>11.1f} {r['errors']:>7} {r['reloaded']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+from benchmarks.mock_groq import MockGroqServer
+
+QUERIES = [
+    "Do you have a room available next weekend?",
+    "What is the price of the ocean view room?",
+    "Is there WiFi?",
+    "Where is the hotel located?",
+    "Do you offer yoga classes?",
+    "Can I book a room for two nights?",
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run_mode(answer_query, server, mode, iterations):
+    server.reset_stats()
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        answer_query(QUERIES[i % len(QUERIES)], mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+    usage = server.snapshot()
+    return {
+        "mode": mode,
+        "requests": iterations,
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "llm_calls_per_request": usage["requests"] / iterations,
+        "tokens_per_request": (usage["prompt_tokens"] + usage["completion_tokens"]) / iterations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two-call and single-shot query modes")
+    parser.add_argument("--iterations", type=int, default=60)
+    parser.add_argument("--ttft-ms", type=float, default=150.0)
+    parser.add_argument("--per-token-ms", type=float, default=2.0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    server = MockGroqServer(ttft_ms=args.ttft_ms, per_token_ms=args.per_token_ms).start()
+    os.environ["GROQ_BASE_URL"] = server.base_url
+    os.environ.setdefault("GROQ_API_KEY", "mock-key")
+    # Send every classification to the LLM so two-call mode really makes two calls
+    os.environ["CLASSIFIER_CONFIDENCE_THRESHOLD"] = "1.01"
+    os.environ["RESPONSE_CACHE_SIZE"] = "0"
+    from chatbot import answer_query
+
+    try:
+        results = [run_mode(answer_query, server, mode, args.iterations)
+                   for mode in ("two_call", "single_shot")]
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<12} {'p50 ms':>8} {'p95 ms':>8} {'calls/req':>10} {'tokens/req':>11}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+              f"{r['llm_calls_per_request']:>10.2f} {r['tokens_per_request']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
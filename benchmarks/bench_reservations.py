@@ -0,0 +1,110 @@
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from availability import ensure_schema
+from reservations import CONFLICT_SQL, INSERT_BOOKING_SQL, ReservationBusy, ReservationService, RoomUnavailable
+
+# Pairs of bookings for the same room whose stays overlap
+DOUBLE_BOOKINGS_SQL = """
+SELECT COUNT(*) FROM bookings a JOIN bookings b
+ON a.room_id = b.room_id AND a.id < b.id AND a.check_in < b.check_out AND b.check_in < a.check_out
+"""
+
+
+def create_db(path, rooms):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        conn.execute("CREATE TABLE rooms (id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL)")
+        conn.executemany("INSERT INTO rooms (description) VALUES (?)", [(f"Room {i}",) for i in range(1, rooms + 1)])
+    conn.close()
+    ensure_schema(path)
+
+
+# Stays of 1-4 nights packed into a short window, so most attempts collide
+def attempts(count, rooms, window, seed):
+    rng = random.Random(seed)
+    start = date.today() + timedelta(days=30)
+    for i in range(count):
+        check_in = start + timedelta(days=rng.randrange(window))
+        yield rng.randint(1, rooms), check_in, check_in + timedelta(days=rng.randint(1, 4)), f"guest-{i}"
+
+
+# Check-then-insert without a write lock or version check: what a webhook handler
+# would do without the reservation service
+class NaiveBooking:
+    def __init__(self, path):
+        self.path = path
+
+    def book(self, room_id, check_in, check_out, guest=None):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            stay = (check_in.isoformat(), check_out.isoformat())
+            if conn.execute(CONFLICT_SQL, (room_id, *stay)).fetchone():
+                raise RoomUnavailable(room_id)
+            return conn.execute(INSERT_BOOKING_SQL, (room_id, *stay, guest)).lastrowid
+        finally:
+            conn.close()
+
+
+def run(service, args):
+    outcomes = {"booked": 0, "unavailable": 0, "busy": 0}
+
+    def attempt(args_):
+        try:
+            service.book(*args_)
+            return "booked"
+        except RoomUnavailable:
+            return "unavailable"
+        except ReservationBusy:
+            return "busy"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        for outcome in pool.map(attempt, attempts(args.attempts, args.rooms, args.window, args.seed)):
+            outcomes[outcome] += 1
+    return outcomes, time.perf_counter() - start
+
+
+# Fires conflicting booking attempts from a thread pool and checks the bookings table
+# for overlapping stays afterwards. Exits non-zero if the reservation service let one
+# through.
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent booking stress test against rooms.db")
+    parser.add_argument("--attempts", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--rooms", type=int, default=5)
+    parser.add_argument("--window", type=int, default=60, help="days the stays are spread over")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--naive", action="store_true", help="also run check-then-insert without locking")
+    args = parser.parse_args()
+
+    print(f"{args.attempts} attempts from {args.threads} threads on {args.rooms} rooms over {args.window} days")
+    print(f"{'write path':<12} {'booked':>7} {'refused':>8} {'gave up':>8} {'secs':>6} {'writes/s':>9} {'attempts/s':>11} {'double':>7}")
+    failed = False
+    for name in (["naive"] if args.naive else []) + ["service"]:
+        with tempfile.TemporaryDirectory(prefix="bench-reservations-") as workdir:
+            path = os.path.join(workdir, "rooms.db")
+            create_db(path, args.rooms)
+            service = NaiveBooking(path) if name == "naive" else ReservationService(path)
+            outcomes, elapsed = run(service, args)
+            conn = sqlite3.connect(path)
+            double = conn.execute(DOUBLE_BOOKINGS_SQL).fetchone()[0]
+            conn.close()
+        print(f"{name:<12} {outcomes['booked']:>7} {outcomes['unavailable']:>8} {outcomes['busy']:>8} {elapsed:>6.2f} "
+              f"{outcomes['booked'] / elapsed:>9.0f} {args.attempts / elapsed:>11.0f} {double:>7}")
+        if name == "service":
+            print(f"service retries: {service.stats()}")
+            failed = double > 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import random
+import statistics
+import time
+
+from room_index import RoomIndex
+from room_store import format_rooms
+
+VIEWS = ["Ocean View", "Garden View", "Pool View", "Courtyard", "Backwater View", "Hill View"]
+KINDS = ["Deluxe Room", "Luxury Room", "Family Suite", "Twin Room", "Villa", "Cottage", "Studio"]
+FEATURES = ["king bed", "twin beds", "bathtub", "rain shower", "balcony", "kitchenette",
+            "private pool", "sofa bed", "work desk", "bay window", "jacuzzi", "sea-facing veranda"]
+PROPERTIES = ["Thira Beach Home", "Thira Backwaters", "Thira Hills", "Thira Heritage"]
+QUERIES = [
+    "Do you have a family suite with a kitchenette?",
+    "I want an ocean view room with a bathtub",
+    "Any villa with a private pool at Thira Hills?",
+    "twin beds and a work desk please",
+    "cottage with a jacuzzi",
+]
+
+
+def synthetic_rooms(count, seed=7):
+    rng = random.Random(seed)
+    rooms = []
+    for i in range(count):
+        title = f"{rng.choice(VIEWS)} {rng.choice(KINDS)} {i} - {rng.choice(PROPERTIES)}"
+        features = ", ".join(rng.sample(FEATURES, 4))
+        description = f"{rng.randint(180, 900)} sq. ft. with {features}. Sleeps {rng.randint(1, 6)}."
+        rooms.append((title, description))
+    return rooms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FTS5 room retrieval over a synthetic catalog")
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = synthetic_rooms(args.rooms)
+    index = RoomIndex()
+    start = time.perf_counter()
+    index.rebuild([(room_id, title, desc) for room_id, (title, desc) in enumerate(rows, 1)])
+    print(f"indexed {args.rooms} rooms in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    timings = []
+    for i in range(args.iterations):
+        start = time.perf_counter()
+        matches = index.search(QUERIES[i % len(QUERIES)], args.limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"search p50 {statistics.median(timings):.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms")
+
+    full_prompt = format_rooms(rows)
+    matched_prompt = format_rooms(matches)
+    print(f"room context: {len(full_prompt) // 4} tokens for the whole catalog vs "
+          f"{len(matched_prompt) // 4} tokens for the top {args.limit} matches")
+
+
+if __name__ == "__main__":
+    main()
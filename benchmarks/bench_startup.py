@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from benchmarks.mock_groq import MockGroqServer
+from benchmarks.suite import ROOT, free_port, server_command
+
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| *(\S+)")
+
+# App modules whose import is the cold-start cost of a serving process
+MODULES = ["chatbot", "main", "twilioo", "asgi"]
+
+# (app module, request) used to time a fresh server's first answer
+FIRST_RESPONSE = {
+    "main": ("GET", "/query", {"params": {"query": "Is there WiFi?"}}),
+    "twilioo": ("POST", "/twilio_webhook", {"data": {"From": "whatsapp:+15550000001", "Body": "Is there WiFi?"}}),
+}
+
+
+def base_env(mock_url, workdir):
+    return {
+        **os.environ,
+        "GROQ_API_KEY": "mock-key",
+        "GROQ_BASE_URL": mock_url,
+        "GROQ_LOG_TIMINGS": "0",
+        "RESPONSE_CACHE_SIZE": "0",
+        "WEBHOOK_DEDUP_DB": os.path.join(workdir, "dedup.db"),
+        "PYTHONPATH": ROOT,
+    }
+
+
+# Wall-clock time to import `module` in a fresh interpreter, and the heaviest packages it
+# pulled in according to -X importtime. (The app modules start the Groq keepalive thread
+# during import, which interleaves importtime's nesting, so the total is timed directly.)
+def import_profile(module, env):
+    code = f"import time; start = time.perf_counter(); import {module}; print((time.perf_counter() - start) * 1000)"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and "." not in match.group(3) and match.group(3) != module:
+            name = match.group(3)
+            packages[name] = max(packages.get(name, 0), int(match.group(2)) / 1000)
+    return float(result.stdout.strip().splitlines()[-1]), packages
+
+
+# Milliseconds from launching the server process until its first successful answer
+def first_response(module, env, timeout=60.0):
+    method, path, kwargs = FIRST_RESPONSE[module]
+    if "data" in kwargs:
+        kwargs = {"data": {**kwargs["data"], "MessageSid": f"SM{uuid.uuid4().hex}"}}
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    process = subprocess.Popen(server_command("flask", module, port), cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(timeout=timeout) as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.request(method, url, **kwargs).status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.TransportError:
+                    time.sleep(0.005)
+        raise RuntimeError(f"{module} did not answer within {timeout:.0f}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def check(results, budget, tolerance):
+    failures = []
+    for section in ("import_ms", "first_response_ms"):
+        for name, limit in budget.get(section, {}).items():
+            value = results[section].get(name)
+            if value is not None and value > limit * (1 + tolerance):
+                failures.append(f"{section}.{name}: {value:.0f} ms > budget {limit} ms")
+    return failures
+
+
+# Median cold-start cost over several fresh processes, checked against startup_budget.json.
+# Exits non-zero when a budget is exceeded, so it can gate CI.
+def main():
+    parser = argparse.ArgumentParser(description="Import time and time-to-first-response of each app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", default=BUDGET_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed overshoot of each budget")
+    parser.add_argument("--top", type=int, default=8, help="heaviest top-level packages to list")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    mock = MockGroqServer(latency="fixed:0", per_token_ms=0).start()
+    workdir = tempfile.TemporaryDirectory(prefix="bench-startup-")
+    env = base_env(mock.base_url, workdir.name)
+    results = {"import_ms": {}, "first_response_ms": {}, "packages_ms": {}}
+    try:
+        for module in MODULES:
+            profiles = [import_profile(module, env) for _ in range(args.runs)]
+            results["import_ms"][module] = round(statistics.median(total for total, _ in profiles), 1)
+            packages = profiles[-1][1]
+            heaviest = sorted(packages.items(), key=lambda item: -item[1])[:args.top]
+            results["packages_ms"][module] = {name: round(ms, 1) for name, ms in heaviest}
+        for module in FIRST_RESPONSE:
+            timings = [first_response(module, env) for _ in range(args.runs)]
+            results["first_response_ms"][module] = round(statistics.median(timings), 1)
+    finally:
+        mock.stop()
+        workdir.cleanup()
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+    failures = check(results, budget, args.tolerance)
+
+    if args.json:
+        print(json.dumps({**results, "failures": failures}, indent=2))
+    else:
+        print(f"{'module':<10} {'import ms':>10} {'budget':>8}  heaviest packages")
+        for module, total in results["import_ms"].items():
+            heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in results["packages_ms"][module].items())
+            print(f"{module:<10} {total:>10.1f} {budget['import_ms'].get(module, '-')!s:>8}  {heaviest}")
+        print(f"\n{'app':<10} {'first response ms':>18} {'budget':>8}")
+        for module, total in results["first_response_ms"].items():
+            print(f"{module:<10} {total:>18.1f} {budget['first_response_ms'].get(module, '-')!s:>8}")
+        for failure in failures:
+            print(f"OVER BUDGET {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
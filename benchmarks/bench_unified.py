@@ -0,0 +1,119 @@
+import argparse
+import os
+import random
+import subprocess
+import tempfile
+import uuid
+
+import httpx
+
+from benchmarks.mock_groq import MockGroqServer
+from benchmarks.suite import ROOT, free_port, server_command, wait_until_up
+
+QUESTIONS = [
+    "Is there WiFi?",
+    "Where is the hotel located?",
+    "Do you serve breakfast?",
+    "Can I rent a cycle?",
+    "Do you have yoga classes?",
+    "Is there power backup?",
+    "Is the property wheelchair accessible?",
+    "What is your phone number?",
+    "Do you have parking?",
+    "Is there CCTV?",
+    "How far is the beach?",
+    "Do you have hot water?",
+]
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def start_server(module, channels, env, workdir):
+    port = free_port()
+    process = subprocess.Popen(server_command("flask", module, port), cwd=ROOT,
+                               env={**env, "SERVE_CHANNELS": channels,
+                                    "WEBHOOK_DEDUP_DB": os.path.join(workdir, f"{port}-dedup.db")},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    wait_until_up(url, process)
+    return process, url
+
+
+# Ask the same guest questions over both channels, each WhatsApp message from a new
+# number so no conversation history bypasses the cache
+def drive(web_url, whatsapp_url, rounds, seed):
+    rng = random.Random(seed)
+    with httpx.Client(timeout=60) as client:
+        for _ in range(rounds):
+            for question in rng.sample(QUESTIONS, len(QUESTIONS)):
+                if rng.random() < 0.5:
+                    client.get(f"{web_url}/query", params={"query": question}).raise_for_status()
+                else:
+                    client.post(f"{whatsapp_url}/twilio_webhook", data={
+                        "From": f"whatsapp:+1555{rng.randrange(10 ** 7):07d}",
+                        "Body": question,
+                        "MessageSid": f"SM{uuid.uuid4().hex}",
+                    }).raise_for_status()
+
+
+def measure(layout, mock, env, rounds, seed):
+    with tempfile.TemporaryDirectory(prefix="bench-unified-") as workdir:
+        if layout == "split":
+            servers = [start_server("main", "web", env, workdir), start_server("twilioo", "whatsapp", env, workdir)]
+            web_url, whatsapp_url = servers[0][1], servers[1][1]
+        else:
+            servers = [start_server("main", "web,whatsapp", env, workdir)]
+            web_url = whatsapp_url = servers[0][1]
+        try:
+            mock.reset_stats()
+            drive(web_url, whatsapp_url, rounds, seed)
+            hits = lookups = 0
+            for _, url in servers:
+                cache = httpx.get(f"{url}/stats").json()["response_cache"]
+                hits += cache["exact_hits"] + cache["similar_hits"]
+                lookups += cache["exact_hits"] + cache["similar_hits"] + cache["misses"]
+            return {
+                "processes": len(servers),
+                "rss_mb": sum(rss_mb(process.pid) for process, _ in servers),
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "groq_calls": mock.snapshot()["requests"],
+            }
+        finally:
+            for process, _ in servers:
+                process.terminate()
+                process.wait(timeout=10)
+
+
+# Memory and response-cache effectiveness of one process serving both channels versus
+# separate web and WhatsApp processes, under the same mixed traffic
+def main():
+    parser = argparse.ArgumentParser(description="Split web/WhatsApp processes vs one unified process")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    mock = MockGroqServer(latency="fixed:20", per_token_ms=0.1).start()
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "mock-key",
+        "GROQ_BASE_URL": mock.base_url,
+        "GROQ_LOG_TIMINGS": "0",
+        "PYTHONPATH": ROOT,
+    }
+    try:
+        print(f"{'layout':<10} {'processes':>9} {'RSS MB':>8} {'hit ratio':>10} {'Groq calls':>11}")
+        for layout in ("split", "unified"):
+            r = measure(layout, mock, env, args.rounds, args.seed)
+            print(f"{layout:<10} {r['processes']:>9} {r['rss_mb']:>8.1f} {r['hit_ratio']:>10.2f} {r['groq_calls']:>11}")
+    finally:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+
+# Held-out guest questions with the label the LLM classifier should give them
+# ("1" = booking / room details, "2" = hotel info). None of them are in
+# classifier.TRAINING_SAMPLES, so accuracy here is what the fast path does on unseen queries.
+HELDOUT_CASES = [
+    ("Can I book the deluxe room for next Friday?", "1"),
+    ("Are there any rooms left for Christmas?", "1"),
+    ("I'd like to reserve two rooms", "1"),
+    ("How much is a night in the sea view room?", "1"),
+    ("What's the tariff for a double room?", "1"),
+    ("Is the heritage room free on the 3rd?", "1"),
+    ("We are four people, which room fits us?", "1"),
+    ("I want a room for me and my wife", "1"),
+    ("Can I get a room with a balcony", "1"),
+    ("Does the room come with air conditioning", "1"),
+    ("Is there a TV in the room", "1"),
+    ("What size is the bed in the room", "1"),
+    ("How many rooms do you have", "1"),
+    ("Can I stay from Monday to Thursday", "1"),
+    ("What are your check-out times", "1"),
+    ("Do you have a room for tonight", "1"),
+    ("I need accommodation for a week in January", "1"),
+    ("Can we extend our stay by one more day", "1"),
+    ("Which room is the cheapest", "1"),
+    ("Please hold a room for us on the 20th", "1"),
+    ("Do rooms have an attached bathroom", "1"),
+    ("Is there space for a baby cot in the room", "1"),
+    ("Can my family of five share one room", "1"),
+    ("What's the difference between your rooms", "1"),
+    ("Do you have the wifi password", "2"),
+    ("How do I reach the hotel from the airport", "2"),
+    ("Is there a good restaurant nearby", "2"),
+    ("What time is breakfast served", "2"),
+    ("Can I park my car at the hotel", "2"),
+    ("Do you have an EV charger", "2"),
+    ("Is the water safe to drink", "2"),
+    ("What happens during a power cut", "2"),
+    ("Are there cameras on the property", "2"),
+    ("Can I do yoga in the morning", "2"),
+    ("Do you rent out bicycles", "2"),
+    ("How far is the beach from the hotel", "2"),
+    ("What is your WhatsApp number", "2"),
+    ("Who owns the homestay", "2"),
+    ("What is the architecture of the building like", "2"),
+    ("Is there a lounge for guests", "2"),
+    ("Can I use the kitchen", "2"),
+    ("Is the hotel accessible for a wheelchair user", "2"),
+    ("What can we visit around here", "2"),
+    ("Good morning", "2"),
+    ("Thank you so much", "2"),
+    ("Is it safe for solo women travellers", "2"),
+    ("Are pets allowed in the room?", "2"),
+    ("What is the cancellation policy?", "2"),
+    ("Do you allow smoking", "2"),
+    ("Is the area noisy at night", "2"),
+]
+
+
+# Accuracy and coverage of the fast path (rules + hashed naive Bayes) on the held-out set.
+# Queries under the threshold go to the LLM, so "coverage" is the share answered locally
+# and "accuracy" is measured on those; raise the threshold to trade coverage for accuracy.
+def evaluate(classifier, threshold, cases=HELDOUT_CASES):
+    answered, correct, wrong = 0, 0, []
+    for query, expected in cases:
+        label, confidence, path = classifier.predict(query)
+        if confidence < threshold:
+            continue
+        answered += 1
+        if label == expected:
+            correct += 1
+        else:
+            wrong.append({"query": query, "label": label, "confidence": round(confidence, 3), "path": path})
+    return {
+        "threshold": threshold,
+        "coverage": answered / len(cases),
+        "accuracy": correct / answered if answered else 1.0,
+        "answered": answered,
+        "wrong": wrong,
+    }
+
+
+def main():
+    from classifier import CONFIDENCE_THRESHOLD, fast_classifier
+
+    parser = argparse.ArgumentParser(description="Evaluate the fast-path classifier on held-out queries")
+    parser.add_argument("--thresholds", type=float, nargs="*", default=[0.6, 0.7, 0.8, 0.9, 0.95],
+                        help="extra thresholds to report next to CLASSIFIER_CONFIDENCE_THRESHOLD")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    thresholds = sorted(set(args.thresholds) | {CONFIDENCE_THRESHOLD})
+    results = [evaluate(fast_classifier, threshold) for threshold in thresholds]
+    if args.json:
+        print(json.dumps({"cases": len(HELDOUT_CASES), "configured": CONFIDENCE_THRESHOLD,
+                          "results": results}, indent=2))
+        return
+    print(f"{len(HELDOUT_CASES)} held-out queries")
+    for result in results:
+        marker = "  <- configured" if result["threshold"] == CONFIDENCE_THRESHOLD else ""
+        print(f"threshold {result['threshold']:.2f}: accuracy {result['accuracy']:.1%} "
+              f"on {result['answered']} local, coverage {result['coverage']:.1%}{marker}")
+    configured = next(r for r in results if r["threshold"] == CONFIDENCE_THRESHOLD)
+    for miss in configured["wrong"]:
+        print(f"  wrong: {miss['query']!r} -> {miss['label']} ({miss['confidence']}, {miss['path']})")
+
+
+if __name__ == "__main__":
+    main()
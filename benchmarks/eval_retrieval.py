@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+
+# Each case pairs a guest question with the fact the answer has to contain
+CASES = [
+    ("What is your phone number?", "+91-94470 44788"),
+    ("How can I contact you?", "+91-94470 44788"),
+    ("What's your email address?", "thirabeachhomestay@gmail.com"),
+    ("Where is the hotel located?", "Kothakulam Beach"),
+    ("Is there wifi?", "High-speed internet with WiFi"),
+    ("Do you have internet access?", "High-speed internet with WiFi"),
+    ("Do you offer yoga?", "Yoga classes"),
+    ("Can I ride a bicycle there?", "Cycling opportunities"),
+    ("Where can I eat?", "Samudrakani Kitchen"),
+    ("Is there a restaurant?", "Samudrakani Kitchen"),
+    ("Is the drinking water safe?", "RO and UV-filtered drinking water"),
+    ("Do you have hot water?", "24/7 hot water"),
+    ("What if the power goes out?", "Uninterrupted power backup"),
+    ("Is there CCTV?", "CCTV surveillance"),
+    ("Can I charge my electric car?", "Electric charging facility"),
+    ("Is it wheelchair accessible?", "differently-abled"),
+    ("How far is the sea?", "150 meters"),
+    ("Do the rooms have a TV?", "43-inch 4K television"),
+    ("Is there air conditioning?", "air conditioning"),
+    ("Does the bathroom have a bathtub?", "bathtub"),
+    ("How big is the room?", "250 sq. ft."),
+    ("What is the bed like?", "6x6.5 ft cot"),
+    ("What is the architecture style?", "Italian-Kerala heritage"),
+    ("Is there a veranda?", "veranda"),
+]
+
+FACILITIES = ["air conditioning", "Wardrobe", "two chairs", "window bay bed", "43-inch 4K television",
+              "bathtub", "250 sq. ft."]
+AMENITIES = ["drinking water", "24/7 hot water", "softened water", "power backup", "WiFi", "CCTV",
+             "Electric charging", "differently-abled"]
+SERVICES = ["Yoga classes", "Cycling", "Samudrakani Kitchen", "lounge", "veranda"]
+
+# List questions: the whole section has to come back, not the best few bullets
+SECTION_CASES = [
+    ("What amenities do you offer?", AMENITIES),
+    ("What facilities do you have?", FACILITIES),
+    ("What services do you provide?", SERVICES),
+    ("List your amenities and services", AMENITIES + SERVICES),
+]
+
+# "Is X included?" must find X, and heading words like "include" must not pull in
+# unrelated bullets
+INCLUDED_CASES = [
+    ("Is breakfast included in the price?", ["Samudrakani Kitchen"], ["Wardrobe", "television"]),
+    ("Is WiFi included?", ["WiFi"], ["Wardrobe", "television"]),
+    ("Are yoga classes included?", ["Yoga classes"], ["Wardrobe", "television"]),
+]
+
+
+# Offline check that retrieval keeps the facts needed to answer (parity with sending the
+# full HOTEL_INFO, which always contains them), leaves out unrelated bullets for the
+# "included" questions, and how many prompt tokens it saves
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate HOTEL_INFO retrieval against full context")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GROQ_API_KEY", "offline-eval")
+    from chatbot import HOTEL_INFO, hotel_retriever
+    from retrieval import estimate_tokens
+
+    cases = [(question, [fact], []) for question, fact in CASES]
+    cases += [(question, facts, []) for question, facts in SECTION_CASES]
+    cases += INCLUDED_CASES
+
+    full_tokens = estimate_tokens(HOTEL_INFO)
+    misses, retrieved_tokens = [], []
+    for question, facts, absent in cases:
+        context = hotel_retriever.context(question)
+        retrieved_tokens.append(estimate_tokens(context))
+        if any(fact not in context for fact in facts) or any(text in context for text in absent):
+            misses.append(question)
+
+    hits = len(cases) - len(misses)
+    average = sum(retrieved_tokens) / len(retrieved_tokens)
+    results = {
+        "cases": len(cases),
+        "fact_recall_full_context": 1 - len(INCLUDED_CASES) / len(cases),
+        "fact_recall_retrieved": hits / len(cases),
+        "missed": misses,
+        "full_context_tokens": full_tokens,
+        "avg_retrieved_tokens": round(average, 1),
+        "reduction_factor": round(full_tokens / average, 1),
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    full_hits = len(cases) - len(INCLUDED_CASES)
+    print(f"fact recall: {hits}/{len(cases)} (full context: {full_hits}/{len(cases)})")
+    for question in misses:
+        print(f"  missed: {question}")
+    print(f"context tokens: {full_tokens} full vs {average:.1f} retrieved "
+          f"({results['reduction_factor']}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+import httpx
+
+from benchmarks.report import print_table, summarize
+
+QUERIES = [
+    "Do you have a room available next weekend?",
+    "Is there WiFi?",
+    "Where is the hotel located?",
+    "Can I book a room for two nights?",
+    "Which rooms are free on February 10?",
+    "Do you serve breakfast?",
+    "How much is a room per night?",
+    "Can I rent a cycle?",
+]
+ENDPOINTS = ["query", "query_stream", "twilio_webhook"]
+
+
+# Each request gets a distinct suffix so the response cache cannot serve it
+def query_for(i):
+    return f"{QUERIES[i % len(QUERIES)]} ({i})"
+
+
+# Reads the SSE body from /query/stream and returns the time of the first token
+async def read_stream(response, start):
+    first_token = None
+    async for line in response.aiter_lines():
+        if first_token is None and line.startswith("data: ") and "token" in line:
+            first_token = (time.perf_counter() - start) * 1000
+    return first_token
+
+
+async def send(client, url, endpoint, i, run_id):
+    query = query_for(i)
+    if endpoint == "query":
+        response = await client.get(f"{url}/query", params={"query": query})
+        return response.status_code, None
+    if endpoint == "query_stream":
+        start = time.perf_counter()
+        async with client.stream("GET", f"{url}/query/stream", params={"query": query}) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return response.status_code, None
+            return response.status_code, await read_stream(response, start)
+    response = await client.post(f"{url}/twilio_webhook", data={
+        "From": f"whatsapp:+1555{i:07d}",
+        "To": "whatsapp:+14155238886",
+        "Body": query,
+        "MessageSid": f"SM{run_id}{i:08d}",
+    })
+    return response.status_code, None
+
+
+# Closed-loop load: `concurrency` workers send requests back to back until `requests`
+# have been sent or `duration` seconds have passed. requests == concurrency gives a
+# burst of simultaneous conversations.
+async def run_load(url, endpoint, concurrency, requests=None, duration=None, timeout=60.0):
+    if requests is None and duration is None:
+        requests = concurrency
+    latencies, ttfts, errors = [], [], []
+    counter = itertools.count()
+    run_id = f"{int(time.time() * 1000) % 10 ** 8:08d}"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        start = time.perf_counter()
+        deadline = start + duration if duration else None
+
+        async def worker():
+            while True:
+                i = next(counter)
+                if requests is not None and i >= requests:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                sent = time.perf_counter()
+                try:
+                    status, ttft = await send(client, url, endpoint, i, run_id)
+                except httpx.HTTPError as e:
+                    errors.append(type(e).__name__)
+                    continue
+                if status != 200:
+                    errors.append(status)
+                    continue
+                latencies.append((time.perf_counter() - sent) * 1000)
+                if ttft is not None:
+                    ttfts.append(ttft)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, ttfts, errors, elapsed
+
+
+# Point this at a running server (main.py, twilioo.py or asgi.py) whose GROQ_BASE_URL is
+# `python -m benchmarks.mock_groq`; `python -m benchmarks.suite` does all of that for you.
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for /query, /query/stream and /twilio_webhook")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="query")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 1000, 2000])
+    parser.add_argument("--requests", type=int, default=None, help="total per level (default: one per worker)")
+    parser.add_argument("--duration", type=float, default=None, help="seconds per level instead of a request count")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    modes = {}
+    for concurrency in args.concurrency:
+        latencies, ttfts, errors, elapsed = asyncio.run(run_load(
+            args.url, args.endpoint, concurrency, args.requests, args.duration, args.timeout))
+        modes[f"c={concurrency}"] = summarize(latencies, errors, elapsed, ttfts=ttfts)
+    if args.json:
+        print(json.dumps(modes, indent=2))
+    else:
+        print_table({"modes": modes})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CLASSIFY_MARKER = "Respond with only the number"
+BATCH_MARKER = "Respond with one line per query"
+BOOKING_WORDS = re.compile(r"book|room|reserv|availab|night|vacan", re.IGNORECASE)
+
+
+# Rough token estimate used for usage accounting (about four characters per token)
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+# Time-to-first-token distribution, parsed from "fixed:150", "uniform:100,300",
+# "normal:150,40", "lognormal:150,0.5" (median ms, sigma) or "exponential:150" (mean ms)
+class Latency:
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+    def __init__(self, kind="fixed", *params):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+
+    @classmethod
+    def parse(cls, spec):
+        if isinstance(spec, Latency):
+            return spec
+        if isinstance(spec, (int, float)):
+            return cls("fixed", spec)
+        kind, _, params = str(spec).partition(":")
+        if not params:
+            return cls("fixed", kind)
+        return cls(kind, *params.split(","))
+
+    def sample(self, rng):
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(p[0]), p[1])
+        else:
+            value = rng.expovariate(1 / p[0])
+        return max(0.0, value)
+
+    def __str__(self):
+        return f"{self.kind}:{','.join(f'{p:g}' for p in self.params)}"
+
+
+# Local stand-in for Groq's OpenAI-compatible chat completions endpoint. Supports
+# streamed responses, rate-limit headers and injected 429/5xx errors.
+class MockGroqServer:
+    def __init__(self, host="127.0.0.1", port=0, ttft_ms=150.0, per_token_ms=2.0, reply_tokens=80,
+                 latency=None, error_rate=0.0, error_status=429, retry_after=1.0,
+                 request_limit=14400, token_limit=500000, request_reset="6s", token_reset="7.66s", seed=None):
+        self.latency = Latency.parse(latency if latency is not None else ttft_ms)
+        self.per_token_ms = per_token_ms
+        self.reply_tokens = reply_tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.request_limit = request_limit
+        self.token_limit = token_limit
+        self.request_reset = request_reset
+        self.token_reset = token_reset
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._server.request_queue_size = 4096
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = 0
+            self.streams = 0
+            self.errors = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "streams": self.streams,
+                "errors": self.errors,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    def _sample(self):
+        with self._lock:
+            return self.latency.sample(self._rng), self._rng.random() < self.error_rate
+
+    def rate_limit_headers(self):
+        with self._lock:
+            used_requests, used_tokens = self.requests, self.prompt_tokens + self.completion_tokens
+        return {
+            "x-ratelimit-limit-requests": str(self.request_limit),
+            "x-ratelimit-remaining-requests": str(max(0, self.request_limit - used_requests)),
+            "x-ratelimit-reset-requests": self.request_reset,
+            "x-ratelimit-limit-tokens": str(self.token_limit),
+            "x-ratelimit-remaining-tokens": str(max(0, self.token_limit - used_tokens)),
+            "x-ratelimit-reset-tokens": self.token_reset,
+        }
+
+    # Returns (content, prompt_tokens, completion_tokens) for a chat request
+    def answer(self, payload):
+        prompt = "\n".join(message.get("content", "") for message in payload.get("messages", []))
+        max_tokens = payload.get("max_tokens") or self.reply_tokens
+        if BATCH_MARKER in prompt:
+            queries = re.findall(r"^(\d+)\) (.*)$", prompt, re.MULTILINE)
+            content = "\n".join(f"{n}: {'1' if BOOKING_WORDS.search(q) else '2'}" for n, q in queries)
+            completion_tokens = 3 * len(queries)
+        elif CLASSIFY_MARKER in prompt:
+            query = prompt.split("Query:", 1)[-1]
+            content = "1" if BOOKING_WORDS.search(query) else "2"
+            completion_tokens = 1
+        else:
+            completion_tokens = min(self.reply_tokens, max_tokens)
+            content = " ".join(["lorem"] * completion_tokens)
+        return content, estimate_tokens(prompt), completion_tokens
+
+    def _record(self, prompt_tokens, completion_tokens, stream=False):
+        with self._lock:
+            self.requests += 1
+            self.streams += stream
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            return self.requests
+
+    def complete(self, payload, ttft_ms=None):
+        content, prompt_tokens, completion_tokens = self.answer(payload)
+        if ttft_ms is None:
+            ttft_ms = self._sample()[0]
+        time.sleep((ttft_ms + completion_tokens * self.per_token_ms) / 1000)
+        number = self._record(prompt_tokens, completion_tokens)
+        return {
+            "id": f"chatcmpl-mock-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage(prompt_tokens, completion_tokens),
+        }
+
+    # Yields chat.completion.chunk dicts, one word per chunk, with Groq's x_groq usage
+    # attached to the final chunk
+    def stream(self, payload, ttft_ms):
+        content, prompt_tokens, completion_tokens = self.answer(payload)
+        words = content.split(" ")
+        number = self._record(prompt_tokens, completion_tokens, stream=True)
+        base = {
+            "id": f"chatcmpl-mock-{number}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+        }
+        time.sleep(ttft_ms / 1000)
+        per_word_ms = self.per_token_ms * completion_tokens / max(1, len(words))
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(per_word_ms / 1000)
+            text = word if i == 0 else f" {word}"
+            yield {**base, "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+        yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+               "x_groq": {"id": base["id"], "usage": usage(prompt_tokens, completion_tokens)}}
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, Nagle plus the
+            # client's delayed ACK adds ~40 ms to every response
+            disable_nagle_algorithm = True
+
+            def send_json(self, status, document, headers=()):
+                body = json.dumps(document).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self.send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                ttft_ms, fail = mock._sample()
+                if fail:
+                    self.send_error_response()
+                elif payload.get("stream"):
+                    self.send_stream(payload, ttft_ms)
+                else:
+                    self.send_json(200, mock.complete(payload, ttft_ms), mock.rate_limit_headers().items())
+
+            def send_error_response(self):
+                with mock._lock:
+                    mock.errors += 1
+                headers = mock.rate_limit_headers()
+                if mock.error_status == 429:
+                    headers.update({"retry-after": f"{mock.retry_after:g}",
+                                    "x-ratelimit-remaining-requests": "0"})
+                    error = {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}
+                else:
+                    error = {"message": "Internal server error (mock)", "type": "internal_server_error"}
+                self.send_json(mock.error_status, {"error": error}, headers.items())
+
+            # Server-sent events without a Content-Length; the connection closes at the end
+            def send_stream(self, payload, ttft_ms):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                for name, value in mock.rate_limit_headers().items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    for chunk in mock.stream(payload, ttft_ms):
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                        self.wfile.flush()
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def usage(prompt_tokens, completion_tokens):
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock Groq chat completions server")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="fixed:150",
+                        help="time to first token, e.g. fixed:150, uniform:100,300, lognormal:150,0.5")
+    parser.add_argument("--per-token-ms", type=float, default=2.0)
+    parser.add_argument("--reply-tokens", type=int, default=80)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=429)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockGroqServer(port=args.port, latency=args.latency, per_token_ms=args.per_token_ms,
+                            reply_tokens=args.reply_tokens, error_rate=args.error_rate,
+                            error_status=args.error_status, seed=args.seed)
+    print(f"Mock Groq server listening on {server.base_url} (set GROQ_BASE_URL to this), "
+          f"latency {server.latency}, error rate {args.error_rate:g}")
+    server._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def latency_summary(values):
+    if not values:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "p99_ms": round(percentile(values, 99), 1),
+        "max_ms": round(max(values), 1),
+    }
+
+
+# Summarise one load run: completed requests, errors by kind, throughput, latency
+# percentiles and (when upstream usage is known) tokens per completed request
+def summarize(latencies, errors, elapsed, usage=None, ttfts=None):
+    errors_by_kind = {}
+    for error in errors:
+        errors_by_kind[str(error)] = errors_by_kind.get(str(error), 0) + 1
+    result = {
+        "requests": len(latencies) + len(errors),
+        "ok": len(latencies),
+        "errors": len(errors),
+        "errors_by_kind": errors_by_kind,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        **latency_summary(latencies),
+    }
+    if ttfts:
+        result["ttft"] = latency_summary(ttfts)
+    if usage is not None:
+        completed = max(1, len(latencies))
+        result["upstream"] = usage
+        result["llm_calls_per_request"] = round(usage["requests"] / completed, 3)
+        result["prompt_tokens_per_request"] = round(usage["prompt_tokens"] / completed, 1)
+        result["completion_tokens_per_request"] = round(usage["completion_tokens"] / completed, 1)
+        result["tokens_per_request"] = round(
+            (usage["prompt_tokens"] + usage["completion_tokens"]) / completed, 1)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(config):
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": config,
+    }
+
+
+def save(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+COLUMNS = [
+    ("ok", "ok", "{:>6}"),
+    ("errors", "err", "{:>5}"),
+    ("throughput_rps", "req/s", "{:>8}"),
+    ("p50_ms", "p50 ms", "{:>8}"),
+    ("p95_ms", "p95 ms", "{:>8}"),
+    ("p99_ms", "p99 ms", "{:>8}"),
+    ("tokens_per_request", "tok/req", "{:>8}"),
+]
+
+
+def print_table(report, out=sys.stdout):
+    header = f"{'mode':<18}" + "".join(fmt.format(label) for _, label, fmt in COLUMNS)
+    print(header, file=out)
+    for mode, result in report["modes"].items():
+        row = f"{mode:<18}" + "".join(fmt.format(str(result.get(key))) for key, _, fmt in COLUMNS)
+        print(row, file=out)
+
+
+def change(old, new):
+    if old in (None, 0) or new is None:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+# Side-by-side comparison of two saved runs, mode by mode
+def compare(old, new, out=sys.stdout):
+    print(f"baseline {old['meta'].get('commit')} ({old['meta']['created']}) vs "
+          f"candidate {new['meta'].get('commit')} ({new['meta']['created']})", file=out)
+    keys = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms", "tokens_per_request"]
+    print(f"{'mode':<18}" + "".join(f"{key:>26}" for key in keys), file=out)
+    for mode in new["modes"]:
+        if mode not in old["modes"]:
+            continue
+        a, b = old["modes"][mode], new["modes"][mode]
+        cells = [f"{a.get(k)!s}->{b.get(k)!s} ({change(a.get(k), b.get(k))})" for k in keys]
+        print(f"{mode:<18}" + "".join(f"{cell:>26}" for cell in cells), file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print or compare saved benchmark reports")
+    parser.add_argument("reports", nargs="+", help="one report to print, or baseline and candidate to compare")
+    args = parser.parse_args()
+
+    if len(args.reports) == 1:
+        print_table(load(args.reports[0]))
+    else:
+        compare(load(args.reports[0]), load(args.reports[1]))
+
+
+if __name__ == "__main__":
+    main()
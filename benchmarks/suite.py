@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.loadgen import run_load
+from benchmarks.mock_groq import MockGroqServer
+from benchmarks.report import metadata, print_table, save, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Every way the app can be served: (server, app module, endpoint, extra environment)
+MODES = {
+    "two_call": ("flask", "main", "query", {"QUERY_MODE": "two_call"}),
+    "single_shot": ("flask", "main", "query", {"QUERY_MODE": "single_shot"}),
+    "stream": ("flask", "main", "query_stream", {}),
+    "asgi": ("hypercorn", "asgi", "query", {}),
+    "whatsapp_inline": ("flask", "twilioo", "twilio_webhook", {"WHATSAPP_REPLY_MODE": "inline"}),
+    "whatsapp_async": ("flask", "twilioo", "twilio_webhook",
+                       {"WHATSAPP_REPLY_MODE": "async", "WHATSAPP_SENDER": "fake"}),
+    "asgi_whatsapp": ("hypercorn", "asgi", "twilio_webhook", {"WHATSAPP_REPLY_MODE": "inline"}),
+    "asgi_whatsapp_async": ("hypercorn", "asgi", "twilio_webhook",
+                            {"WHATSAPP_REPLY_MODE": "async", "WHATSAPP_SENDER": "fake"}),
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_command(server, module, port):
+    if server == "hypercorn":
+        return [sys.executable, "-m", "hypercorn", f"{module}:app", "--bind", f"127.0.0.1:{port}"]
+    return [sys.executable, "-m", "flask", "--app", module, "run", "--port", str(port), "--with-threads"]
+
+
+def wait_until_up(url, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{url}/stats", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up within {timeout:.0f}s")
+
+
+# Async WhatsApp replies are sent after the webhook returns, so wait for the delivery
+# workers to finish before reading the mock's token counters
+def wait_for_delivery(url, expected, timeout=120.0):
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        stats = httpx.get(f"{url}/stats", timeout=5.0).json()["whatsapp_delivery"]
+        if stats["delivered"] + stats["failed"] >= expected and not stats["pending"]:
+            return stats, time.monotonic() - start
+        time.sleep(0.05)
+    raise RuntimeError("Timed out waiting for WhatsApp deliveries")
+
+
+def run_mode(name, mock, env, args, workdir):
+    server, module, endpoint, extra = MODES[name]
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    log_path = os.path.join(workdir, f"{name}.log")
+    process_env = {
+        **env,
+        **extra,
+        "WEBHOOK_DEDUP_DB": os.path.join(workdir, f"{name}-dedup.db"),
+    }
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(server_command(server, module, port), cwd=ROOT, env=process_env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+    try:
+        wait_until_up(url, process)
+        if args.warmup:
+            warm, _, _, _ = asyncio.run(run_load(url, endpoint, min(args.warmup, args.concurrency), args.warmup))
+            if extra.get("WHATSAPP_REPLY_MODE") == "async":
+                wait_for_delivery(url, len(warm))
+        before = httpx.get(f"{url}/stats", timeout=5.0).json()
+        mock.reset_stats()
+        latencies, ttfts, errors, elapsed = asyncio.run(run_load(
+            url, endpoint, args.concurrency, args.requests, args.duration, args.timeout))
+        delivery = None
+        if extra.get("WHATSAPP_REPLY_MODE") == "async":
+            queued = before["whatsapp_delivery"]["queued"]
+            stats, drain = wait_for_delivery(url, queued + len(latencies))
+            delivered = stats["delivered"] - before["whatsapp_delivery"]["delivered"]
+            delivery = {
+                "delivered": delivered,
+                "failed": stats["failed"] - before["whatsapp_delivery"]["failed"],
+                "drain_s": round(drain, 3),
+                "delivered_per_s": round(delivered / (elapsed + drain), 2),
+            }
+        result = summarize(latencies, errors, elapsed, usage=mock.snapshot(), ttfts=ttfts)
+        result.update({"server": server, "app": module, "endpoint": endpoint})
+        if delivery:
+            result["delivery"] = delivery
+        return result
+    except Exception:
+        with open(log_path) as log:
+            print(f"{name} failed; server log:\n{log.read()[-4000:]}", file=sys.stderr)
+        raise
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# Starts a mock Groq server, then runs each serving mode in its own server process
+# against it and saves throughput, latency percentiles and tokens per request as JSON
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of every serving mode against a mock Groq API")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per mode")
+    parser.add_argument("--duration", type=float, default=None, help="seconds per mode instead of a request count")
+    parser.add_argument("--warmup", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--latency", default="lognormal:150,0.5", help="mock time-to-first-token distribution")
+    parser.add_argument("--per-token-ms", type=float, default=2.0)
+    parser.add_argument("--reply-tokens", type=int, default=80)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock calls that fail")
+    parser.add_argument("--error-status", type=int, default=429)
+    parser.add_argument("--llm-classify", action="store_true", help="send every classification to the LLM")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None, help="report path (default benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    mock = MockGroqServer(latency=args.latency, per_token_ms=args.per_token_ms, reply_tokens=args.reply_tokens,
+                          error_rate=args.error_rate, error_status=args.error_status, seed=args.seed).start()
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "mock-key",
+        "GROQ_BASE_URL": mock.base_url,
+        "GROQ_LOG_TIMINGS": "0",
+        "PYTHONPATH": ROOT,
+    }
+    if not args.cache:
+        env["RESPONSE_CACHE_SIZE"] = "0"
+    if args.llm_classify:
+        env["CLASSIFIER_CONFIDENCE_THRESHOLD"] = "1.01"
+
+    config = {key: value for key, value in vars(args).items() if key != "out"}
+    report = {"meta": metadata(config), "modes": {}}
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench-suite-") as workdir:
+            for name in args.modes:
+                print(f"running {name} ...", file=sys.stderr)
+                report["modes"][name] = run_mode(name, mock, env, args, workdir)
+    finally:
+        mock.stop()
+
+    out = args.out or os.path.join(ROOT, "benchmarks", "results", time.strftime("%Y%m%d-%H%M%S") + ".json")
+    save(report, out)
+    print_table(report)
+    print(f"\nSaved {out}; compare runs with `python -m benchmarks.report old.json new.json`")
+
+
+if __name__ == "__main__":
+    main()
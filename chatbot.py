@@ -0,0 +1,409 @@
+import itertools
+import os
+import threading
+import time
+import zlib
+import logging
+import metrics
+import tracing
+from availability import AvailabilityIndex, parse_stay
+from classifier import fast_classifier
+from classify_batcher import BATCH_WINDOW_MS, ClassificationBatcher
+from db_pool import ConnectionPool
+from groq_scheduler import groq_scheduler, priority_for
+from model_router import model_router
+from response_cache import response_cache
+from retrieval import BM25Retriever
+from room_store import RoomContextStore
+from transport import build_async_http_client, build_http_client, keepalive_async, start_keepalive
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables from .env when there is one; deployments that set them
+# directly (Render) skip importing python-dotenv
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+if os.path.exists(ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+API_KEY = os.getenv("GROQ_API_KEY")
+if not API_KEY:
+    raise ValueError("GROQ_API_KEY not found in environment variables")
+
+# "two_call" classifies first and then answers; "single_shot" answers in one completion
+QUERY_MODE = os.getenv("QUERY_MODE", "two_call")
+
+DB_PATH = 'rooms.db'
+
+room_db_pool = ConnectionPool(DB_PATH)
+room_availability = AvailabilityIndex(DB_PATH)
+room_store = RoomContextStore(room_db_pool, listeners=[room_availability.reload])
+
+# Hotel information constant
+HOTEL_INFO = """Thira Beach Home is a luxurious seaside retreat that seamlessly blends Italian-Kerala heritage architecture with modern luxury, creating an unforgettable experience. Nestled just 150 meters from the magnificent Arabian Sea, our beachfront property offers a secluded and serene escape with breathtaking 180-degree ocean views. 
+
+The accommodations feature Kerala-styled heat-resistant tiled roofs, natural stone floors, and lime-plastered walls, ensuring a perfect harmony of comfort and elegance. Each of our Luxury Ocean View Rooms is designed to provide an exceptional stay, featuring a spacious 6x6.5 ft cot with a 10-inch branded mattress encased in a bamboo-knitted outer layer for supreme comfort.
+
+Our facilities include:
+- Personalized climate control with air conditioning and ceiling fans
+- Wardrobe and wall mirror
+- Table with attached drawer and two chairs
+- Additional window bay bed for relaxation
+- 43-inch 4K television
+- Luxury bathroom with body jets, glass roof, and oval-shaped bathtub
+- Total room area of 250 sq. ft.
+
+Modern amenities:
+- RO and UV-filtered drinking water
+- 24/7 hot water
+- Water processing unit with softened water
+- Uninterrupted power backup
+- High-speed internet with WiFi
+- Security with CCTV surveillance
+- Electric charging facility
+- Accessible design for differently-abled persons
+
+Additional services:
+- Yoga classes
+- Cycling opportunities
+- On-site dining at Samudrakani Kitchen
+- Stylish lounge and dining area
+- Long veranda with ocean views
+
+Location: Kothakulam Beach, Valappad, Thrissur, Kerala
+Contact: +91-94470 44788
+Email: thirabeachhomestay@gmail.com"""
+HOTEL_INFO_CHECKSUM = zlib.crc32(HOTEL_INFO.encode())
+hotel_retriever = BM25Retriever(HOTEL_INFO)
+
+
+# The Groq SDK (with httpx and pydantic) takes a few hundred milliseconds to import, so
+# the clients are built on first use, normally by the keepalive thread right after startup
+_clients = {}
+_clients_lock = threading.Lock()
+_keepalive_thread = None
+
+# The SDK's own retries are off: they would retry 429s inside a held scheduler slot,
+# hidden from the scheduler, so groq_scheduler.call retries instead
+def _build_clients(kind):
+    from groq import AsyncGroq, Groq
+    if kind == "async":
+        http_client = build_async_http_client()
+        return http_client, AsyncGroq(api_key=API_KEY, http_client=http_client, max_retries=0)
+    http_client = build_http_client()
+    return http_client, Groq(api_key=API_KEY, http_client=http_client, max_retries=0)
+
+def _get_clients(kind):
+    clients = _clients.get(kind)
+    if clients is None:
+        with _clients_lock:
+            clients = _clients.get(kind)
+            if clients is None:
+                clients = _clients[kind] = _build_clients(kind)
+    return clients
+
+def get_groq_client():
+    return _get_clients("sync")[1]
+
+def get_async_groq_client():
+    return _get_clients("async")[1]
+
+# Prewarm and keep alive the Groq connections; call once per serving process. The
+# client is built in the keepalive thread, off the startup path.
+def start_groq_keepalive():
+    global _keepalive_thread
+    with _clients_lock:
+        if _keepalive_thread is None:
+            _keepalive_thread = start_keepalive(lambda: _get_clients("sync")[0], API_KEY)
+    return _keepalive_thread
+
+async def groq_keepalive_async():
+    await keepalive_async(lambda: _get_clients("async")[0], API_KEY)
+
+# Fetch details of the rooms relevant to the query, served from memory and refreshed
+# when the database changes
+def fetch_room_details(query):
+    with metrics.stage("fetch_room_details"):
+        return room_store.context(query)
+
+# Free and booked rooms for the dates in the query, or None when it mentions no dates
+def fetch_availability(query):
+    with metrics.stage("check_availability"):
+        return room_availability.context(query)
+
+# Room details plus availability for booking questions
+def fetch_booking_context(query):
+    details = fetch_room_details(query)
+    availability = fetch_availability(query)
+    return f"{details}\n\n{availability}" if availability else details
+
+# Answers about specific dates depend on the day they are asked and on bookings made
+# since, so they bypass the response cache like answers that depend on history
+def cacheable(query, history=()):
+    return not history and parse_stay(query) is None
+
+# Changes whenever the hotel info or the room data changes; keys the response cache
+def context_version():
+    room_store.get()
+    return (HOTEL_INFO_CHECKSUM, room_store.version)
+
+# Only the parts of the hotel info relevant to the query, within the token budget
+def fetch_hotel_info(query):
+    with metrics.stage("fetch_hotel_info"):
+        return hotel_retriever.context(query)
+
+# Context for a classified query, or None for an unknown classification
+def context_for(query_type, query):
+    if query_type == "1":
+        return fetch_booking_context(query)
+    if query_type == "2":
+        return fetch_hotel_info(query)
+    return None
+
+def classification_messages(query):
+    prompt = f"""Classify the following query:
+    1. Checking details - if it's about booking a hotel room
+    2. Getting information - if it's about general hotel info.
+    
+    Query: {query}
+    Respond with only the number (1 or 2)."""
+    return [{"role": "user", "content": prompt}]
+
+# `history` holds earlier turns of the guest's conversation as chat messages
+def response_messages(query, context, history=()):
+    return [
+        {"role": "system", "content": "You are Maya, a friendly hotel receptionist."},
+        *history,
+        {"role": "user", "content": f"Query: {query}\nContext: {context}"}
+    ]
+
+def single_shot_messages(query, history=()):
+    context = f"Room details:\n{fetch_booking_context(query)}\n\nHotel information:\n{fetch_hotel_info(query)}"
+    return [
+        {"role": "system", "content": "You are Maya, a friendly hotel receptionist. "
+                                      "Use the room details for booking questions and the "
+                                      "hotel information for everything else."},
+        *history,
+        {"role": "user", "content": f"Query: {query}\nContext: {context}"}
+    ]
+
+# Model usage, latency and token metrics for one Groq completion, plus its trace span
+def record_call(task, model, latency, usage):
+    model_router.record(task, model, latency, usage)
+    metrics.record_llm_call(task, model, latency, usage)
+    tracing.record(f"groq_{task}", time.perf_counter() - latency, latency)
+
+# Every Groq completion goes through here: it waits for a scheduler slot in the lane for
+# its channel and query type (or the given priority), and records model usage and latency
+def complete(task, model, messages, max_tokens, query_type=None, priority=None):
+    def create(slot):
+        start = time.perf_counter()
+        raw = get_groq_client().chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens
+        )
+        slot.observe(raw.headers)
+        return raw, start
+
+    raw, start = groq_scheduler.call(priority_for(query_type) if priority is None else priority, create)
+    response = raw.parse()
+    record_call(task, model, time.perf_counter() - start, response.usage)
+    return response.choices[0].message.content
+
+async def complete_async(task, model, messages, max_tokens, query_type=None):
+    async def create(slot):
+        start = time.perf_counter()
+        raw = await get_async_groq_client().chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens
+        )
+        slot.observe(raw.headers)
+        return raw, start
+
+    raw, start = await groq_scheduler.call_async(priority_for(query_type), create)
+    response = await raw.parse()
+    record_call(task, model, time.perf_counter() - start, response.usage)
+    return response.choices[0].message.content
+
+# Runs on the batcher's threads, so the lane comes from the priorities recorded at submit()
+def send_classification_batch(messages, count, priority=None):
+    return complete("classify_batch", model_router.choose("classify"), messages, 8 * count, priority=priority)
+
+# Optional micro-batching of LLM classifications made at the same moment
+classify_batcher = ClassificationBatcher(send_classification_batch) if BATCH_WINDOW_MS > 0 else None
+
+# Classify the query; a small-model answer that isn't "1" or "2" is retried on the escalation model
+def classify_query(query):
+    with metrics.stage("classify"):
+        return _classify(query)
+
+def _classify(query):
+    query_type = fast_classifier.classify(query)
+    if query_type:
+        return query_type
+
+    fast_classifier.record_fallback()
+    if classify_batcher is not None:
+        query_type = classify_batcher.classify(query, priority_for())
+        if query_type:
+            return query_type
+
+    model = model_router.choose("classify", query)
+    query_type = complete("classify", model, classification_messages(query), 10).strip()
+    escalation = model_router.escalation("classify")
+    if query_type not in ("1", "2") and escalation != model:
+        query_type = complete("classify", escalation, classification_messages(query), 10).strip()
+    return query_type
+
+# Generate response
+def generate_response(query, context, history=(), query_type=None):
+    model = model_router.choose("generate", query, query_type, history)
+    with metrics.stage("generate"):
+        return complete("generate", model, response_messages(query, context, history), 300, query_type)
+
+# Answer in one completion with both room details and hotel info as context
+def generate_single_shot_response(query, history=()):
+    model = model_router.choose("single_shot", query, history=history)
+    messages = single_shot_messages(query, history)
+    with metrics.stage("generate"):
+        return complete("single_shot", model, messages, 300)
+
+# Answer a guest query; returns None when the query could not be classified.
+# Answers that depend on conversation history or on dates bypass the response cache.
+def answer_query(query, mode=None, history=()):
+    version = context_version()
+    use_cache = cacheable(query, history)
+    cached = response_cache.get(query, version) if use_cache else None
+    if cached is not None:
+        metrics.record_query("cached")
+        return cached
+
+    start = time.perf_counter()
+    query_type = None
+    if (mode or QUERY_MODE) == "single_shot":
+        metrics.record_query("single_shot")
+        response = generate_single_shot_response(query, history)
+    else:
+        query_type = classify_query(query)
+        metrics.record_query(query_type)
+        context = context_for(query_type, query)
+        response = generate_response(query, context, history, query_type) if context is not None else None
+    if response is not None and use_cache:
+        response_cache.put(query, version, response, time.perf_counter() - start, uses_rooms=query_type != "2")
+    return response
+
+# Like answer_query, but returns an iterator of response tokens (None when unclassifiable)
+def stream_answer(query, mode=None):
+    version = context_version()
+    use_cache = cacheable(query)
+    cached = response_cache.get(query, version) if use_cache else None
+    if cached is not None:
+        metrics.record_query("cached")
+        return iter([cached])
+
+    start = time.perf_counter()
+    if (mode or QUERY_MODE) == "single_shot":
+        metrics.record_query("single_shot")
+        task, model, query_type = "single_shot", model_router.choose("single_shot", query), None
+        messages = single_shot_messages(query)
+    else:
+        query_type = classify_query(query)
+        metrics.record_query(query_type)
+        context = context_for(query_type, query)
+        if context is None:
+            return None
+        task, model = "generate", model_router.choose("generate", query, query_type)
+        messages = response_messages(query, context)
+    return _stream_tokens(query, version if use_cache else None, task, model, messages, query_type, start)
+
+# The scheduler slot is held until the stream has been fully read; a call that fails
+# before its first token queues again like complete(). A version of None keeps the
+# answer out of the response cache.
+def _stream_tokens(query, version, task, model, messages, query_type, start):
+    parts, usage = [], None
+    with metrics.stage("generate"):
+        for attempt in itertools.count():
+            try:
+                with groq_scheduler.slot(priority_for(query_type)) as slot:
+                    call_start = time.perf_counter()
+                    raw = get_groq_client().chat.completions.with_raw_response.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=300,
+                        stream=True
+                    )
+                    slot.observe(raw.headers)
+                    for chunk in raw.parse():
+                        token = chunk.choices[0].delta.content if chunk.choices else None
+                        x_groq = getattr(chunk, "x_groq", None)
+                        usage = getattr(x_groq, "usage", None) or usage
+                        if token:
+                            parts.append(token)
+                            yield token
+                break
+            except Exception as e:
+                delay = None if parts else groq_scheduler.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+    record_call(task, model, time.perf_counter() - call_start, usage)
+    if version is not None:
+        response_cache.put(query, version, "".join(parts), time.perf_counter() - start,
+                           uses_rooms=query_type != "2")
+
+# Async variants of the above for the ASGI app, using the AsyncGroq client
+async def classify_query_async(query):
+    with metrics.stage("classify"):
+        return await _classify_async(query)
+
+async def _classify_async(query):
+    query_type = fast_classifier.classify(query)
+    if query_type:
+        return query_type
+
+    fast_classifier.record_fallback()
+    if classify_batcher is not None:
+        query_type = await classify_batcher.classify_async(query, priority_for())
+        if query_type:
+            return query_type
+
+    model = model_router.choose("classify", query)
+    query_type = (await complete_async("classify", model, classification_messages(query), 10)).strip()
+    escalation = model_router.escalation("classify")
+    if query_type not in ("1", "2") and escalation != model:
+        query_type = (await complete_async("classify", escalation, classification_messages(query), 10)).strip()
+    return query_type
+
+async def generate_response_async(query, context, history=(), query_type=None):
+    model = model_router.choose("generate", query, query_type, history)
+    with metrics.stage("generate"):
+        return await complete_async("generate", model, response_messages(query, context, history), 300, query_type)
+
+async def generate_single_shot_response_async(query, history=()):
+    model = model_router.choose("single_shot", query, history=history)
+    messages = single_shot_messages(query, history)
+    with metrics.stage("generate"):
+        return await complete_async("single_shot", model, messages, 300)
+
+async def answer_query_async(query, mode=None, history=()):
+    version = context_version()
+    use_cache = cacheable(query, history)
+    cached = response_cache.get(query, version) if use_cache else None
+    if cached is not None:
+        metrics.record_query("cached")
+        return cached
+
+    start = time.perf_counter()
+    query_type = None
+    if (mode or QUERY_MODE) == "single_shot":
+        metrics.record_query("single_shot")
+        response = await generate_single_shot_response_async(query, history)
+    else:
+        query_type = await classify_query_async(query)
+        metrics.record_query(query_type)
+        context = context_for(query_type, query)
+        response = await generate_response_async(query, context, history, query_type) if context is not None else None
+    if response is not None and use_cache:
+        response_cache.put(query, version, response, time.perf_counter() - start, uses_rooms=query_type != "2")
+    return response
@@ -0,0 +1,211 @@
+import logging
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Queries classified below this confidence are sent to the LLM instead
+CONFIDENCE_THRESHOLD = float(os.getenv("CLASSIFIER_CONFIDENCE_THRESHOLD", "0.9"))
+HASH_BUCKETS = 2 ** 18
+CALIBRATION_TEMPERATURES = [step / 10 for step in range(5, 101)]
+
+# Keyword rules: a query matching exactly one side is classified without the model
+BOOKING_RULES = re.compile(
+    r"\b(book(s|ed|ing)?|reserv(e|ed|ation|ations)|availab(le|ility)|vacan(t|cy|cies)|"
+    r"check[- ]?(in|out)|tariffs?|rates?|pric(e|es|ing)|(per|a|one|\d+) nights?|nights|"
+    r"room types?|free rooms?|any rooms?|stay (for|from|on))\b",
+    re.IGNORECASE,
+)
+INFO_RULES = re.compile(
+    r"\b(wi-?fi|internet|yoga|cycl(e|es|ing)|location|located|address|directions?|"
+    r"contact|phone|email|e-mail|restaurant|dining|breakfast|kitchen|lounge|veranda|"
+    r"cctv|security|parking|charging|power backup|hot water|drinking water|"
+    r"accessib(le|ility)|wheelchair|amenit(y|ies)|facilit(y|ies)|pets?|dogs?|smok(e|ing)|"
+    r"house rules)\b",
+    re.IGNORECASE,
+)
+
+# Labelled examples for the hashed n-gram model ("1" = booking, "2" = hotel info)
+TRAINING_SAMPLES = [
+    ("I want to book a room", "1"),
+    ("Can I reserve a room for two nights?", "1"),
+    ("Is a room available this weekend?", "1"),
+    ("Do you have any rooms free next week", "1"),
+    ("What is the price of the ocean view room", "1"),
+    ("How much does a room cost per night", "1"),
+    ("What kind of rooms do you have", "1"),
+    ("Tell me about your rooms", "1"),
+    ("I'd like to stay for 3 nights in December", "1"),
+    ("Room details please", "1"),
+    ("What does the luxury room look like", "1"),
+    ("How big is the room", "1"),
+    ("Can we get a double room for a family of four", "1"),
+    ("I need a room for tomorrow", "1"),
+    ("What are the room rates", "1"),
+    ("Is there a vacancy on Friday", "1"),
+    ("What time is check in", "1"),
+    ("Can I get an extra bed in the room", "1"),
+    ("Show me the room options", "1"),
+    ("Which room has a sea view", "1"),
+    ("Does the room have a bathtub", "1"),
+    ("How many guests can stay in one room", "1"),
+    ("Do you have anything for next Saturday", "1"),
+    ("Can we come on the 14th for two days", "1"),
+    ("Do you have WiFi?", "2"),
+    ("Is there wifi available", "2"),
+    ("Where is the hotel located", "2"),
+    ("What is your address", "2"),
+    ("How far is the beach", "2"),
+    ("What is your phone number", "2"),
+    ("How can I contact you", "2"),
+    ("What is your email", "2"),
+    ("Do you have a restaurant", "2"),
+    ("Is breakfast served", "2"),
+    ("Do you offer yoga classes", "2"),
+    ("Can I rent a cycle", "2"),
+    ("Is there power backup", "2"),
+    ("Do you have an electric car charging point", "2"),
+    ("Is the property wheelchair accessible", "2"),
+    ("What amenities do you offer", "2"),
+    ("What facilities are there", "2"),
+    ("Tell me about the hotel", "2"),
+    ("Is the drinking water filtered", "2"),
+    ("Is there CCTV security", "2"),
+    ("Do you have hot water all day", "2"),
+    ("What is there to do nearby", "2"),
+    ("Can I bring my dog along", "2"),
+    ("Is smoking permitted anywhere", "2"),
+    ("What are the house rules", "2"),
+    ("Do I get a refund if I cancel", "2"),
+    ("Hi", "2"),
+    ("Hello, who are you?", "2"),
+]
+
+
+# Multinomial naive Bayes over hashed word unigrams and bigrams
+class HashedNaiveBayes:
+    def __init__(self, buckets=HASH_BUCKETS, alpha=1.0, temperature=1.0):
+        self.buckets = buckets
+        self.alpha = alpha
+        self.temperature = temperature
+        self.feature_counts = {}
+        self.feature_totals = {}
+        self.priors = {}
+        self.vocabulary = set()
+
+    def features(self, text):
+        tokens = re.findall(r"[a-z0-9]+", text.lower())
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [zlib.crc32(gram.encode()) % self.buckets for gram in grams]
+
+    def fit(self, samples):
+        label_counts = Counter(label for _, label in samples)
+        for label, count in label_counts.items():
+            self.priors[label] = math.log(count / len(samples))
+            self.feature_counts[label] = Counter()
+        for text, label in samples:
+            features = self.features(text)
+            self.feature_counts[label].update(features)
+            self.vocabulary.update(features)
+        for label, counts in self.feature_counts.items():
+            self.feature_totals[label] = sum(counts.values())
+        return self
+
+    def scores(self, text):
+        features = [f for f in self.features(text) if f in self.vocabulary]
+        vocabulary_size = len(self.vocabulary)
+        scores = {}
+        for label, prior in self.priors.items():
+            counts = self.feature_counts[label]
+            denominator = self.feature_totals[label] + self.alpha * vocabulary_size
+            scores[label] = prior + sum(
+                math.log((counts[f] + self.alpha) / denominator) for f in features
+            )
+        return scores
+
+    # Naive Bayes counts the overlapping unigrams and bigrams as independent evidence, so
+    # raw probabilities sit near 0 or 1; dividing the log-scores by the temperature fixes that
+    def predict_proba(self, text):
+        scores = {label: score / self.temperature for label, score in self.scores(text).items()}
+        top = max(scores.values())
+        exp_scores = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exp_scores.values())
+        return {label: value / total for label, value in exp_scores.items()}
+
+    # Picks the temperature with the lowest log-loss on leave-one-out predictions over the
+    # training samples, so a confidence of 0.9 means roughly 9 in 10 right on unseen queries
+    def calibrate(self, samples, temperatures=CALIBRATION_TEMPERATURES):
+        held_out = []
+        for index, (text, label) in enumerate(samples):
+            model = HashedNaiveBayes(self.buckets, self.alpha).fit(samples[:index] + samples[index + 1:])
+            if label in model.priors:
+                held_out.append((model.scores(text), label))
+
+        def log_loss(temperature):
+            loss = 0.0
+            for scores, label in held_out:
+                scaled = {key: score / temperature for key, score in scores.items()}
+                top = max(scaled.values())
+                total = sum(math.exp(score - top) for score in scaled.values())
+                loss += math.log(total) - (scaled[label] - top)
+            return loss
+
+        self.temperature = min(temperatures, key=log_loss)
+        logger.debug(f"Calibrated classifier temperature: {self.temperature}")
+        return self
+
+
+# Local classifier that answers confident queries and counts which path was used
+class FastClassifier:
+    def __init__(self, threshold=CONFIDENCE_THRESHOLD, samples=TRAINING_SAMPLES):
+        self.threshold = threshold
+        self.model = HashedNaiveBayes().fit(samples).calibrate(samples)
+        self._lock = threading.Lock()
+        self._paths = Counter()
+
+    def predict(self, query):
+        booking = bool(BOOKING_RULES.search(query))
+        info = bool(INFO_RULES.search(query))
+        if booking != info:
+            return ("1" if booking else "2"), 1.0, "rules"
+        probabilities = self.model.predict_proba(query)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label], "model"
+
+    # Returns "1"/"2" when confident enough, otherwise None so the caller asks the LLM
+    def classify(self, query):
+        label, confidence, path = self.predict(query)
+        if confidence < self.threshold:
+            logger.debug(f"Local classifier unsure ({confidence:.2f}) for: {query}")
+            return None
+        self._record(path)
+        return label
+
+    def record_fallback(self):
+        self._record("llm")
+
+    def _record(self, path):
+        with self._lock:
+            self._paths[path] += 1
+
+    def stats(self):
+        with self._lock:
+            paths = dict(self._paths)
+        total = sum(paths.values())
+        local = paths.get("rules", 0) + paths.get("model", 0)
+        return {
+            "threshold": self.threshold,
+            "temperature": self.model.temperature,
+            "rules": paths.get("rules", 0),
+            "model": paths.get("model", 0),
+            "llm": paths.get("llm", 0),
+            "total": total,
+            "local_ratio": local / total if total else 0.0,
+        }
+
+
+fast_classifier = FastClassifier()
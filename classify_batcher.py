@@ -0,0 +1,162 @@
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Collect classifications arriving within this window into one LLM call (0 disables batching)
+BATCH_WINDOW_MS = float(os.getenv("CLASSIFY_BATCH_WINDOW_MS", "0"))
+BATCH_MAX_SIZE = int(os.getenv("CLASSIFY_BATCH_MAX_SIZE", "16"))
+# Callers stop waiting for a batch after this many seconds and classify on their own
+RESULT_TIMEOUT = float(os.getenv("CLASSIFY_BATCH_TIMEOUT", "15"))
+SEND_WORKERS = 8
+
+
+def batch_classification_messages(queries):
+    numbered = "\n".join(f"{i}) {query}" for i, query in enumerate(queries, 1))
+    prompt = f"""Classify each of the following queries:
+    1. Checking details - if it's about booking a hotel room
+    2. Getting information - if it's about general hotel info.
+
+    Queries:
+{numbered}
+    Respond with one line per query in the form "<query number>: <1 or 2>" and nothing else."""
+    return [{"role": "user", "content": prompt}]
+
+
+# Labels by position from a "<n>: <label>" response; unparseable items are left as None
+def parse_batch_labels(text, count):
+    labels = [None] * count
+    for number, label in re.findall(r"^\s*(\d+)\s*[:).-]\s*([12])\b", text, re.MULTILINE):
+        index = int(number) - 1
+        if 0 <= index < count:
+            labels[index] = label
+    return labels
+
+
+# Resolve one caller's future; a failure here must not leave the rest of the batch waiting
+def _settle(future, result=None, exception=None):
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except Exception:
+        logger.exception("Could not resolve a batched classification")
+
+
+class PendingQuery:
+    __slots__ = ("query", "priority", "future", "enqueued_at")
+
+    def __init__(self, query, priority=None):
+        self.query = query
+        self.priority = priority
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+# A batch runs in the most urgent lane of its members (lower runs first), or None when
+# no member gave one
+def batch_priority(batch):
+    priorities = [pending.priority for pending in batch if pending.priority is not None]
+    return min(priorities) if priorities else None
+
+
+# Micro-batcher for LLM classification. A collector thread gathers queries that arrive
+# within the window (up to max_size), sends them as one numbered prompt through
+# `send(messages, count, priority)` and resolves each caller's future with its label,
+# or None when the batch reply didn't cover it so the caller can classify on its own.
+# Callers that gave up (timed out or disconnected) are left out of the batch.
+class ClassificationBatcher:
+    def __init__(self, send, window_ms=BATCH_WINDOW_MS, max_size=BATCH_MAX_SIZE):
+        self.send = send
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=SEND_WORKERS, thread_name_prefix="classify-batch")
+        self._collector = None
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "queries": 0, "unparsed": 0, "cancelled": 0, "timed_out": 0}
+
+    def _start(self):
+        with self._lock:
+            if self._collector is None:
+                self._collector = threading.Thread(target=self._collect, name="classify-batcher", daemon=True)
+                self._collector.start()
+
+    # Returns a concurrent.futures.Future; async callers can await asyncio.wrap_future(...).
+    # `priority` is the scheduler lane of the caller, taken here because the batch is sent
+    # from another thread where the caller's channel is not set.
+    def submit(self, query, priority=None):
+        self._start()
+        pending = PendingQuery(query, priority)
+        self._queue.put(pending)
+        return pending.future
+
+    # Label for one query, or None when the batch did not answer it in time
+    def classify(self, query, priority=None, timeout=RESULT_TIMEOUT):
+        future = self.submit(query, priority)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            self._count("timed_out")
+            return None
+
+    async def classify_async(self, query, priority=None, timeout=RESULT_TIMEOUT):
+        import asyncio  # imported here so the Flask apps don't load it at startup
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self.submit(query, priority)), timeout)
+        except asyncio.TimeoutError:
+            self._count("timed_out")
+            return None
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = batch[0].enqueued_at + self.window
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._send_batch, batch)
+
+    def _send_batch(self, batch):
+        # Marking the futures running drops cancelled callers and stops later cancels
+        live = [pending for pending in batch if pending.future.set_running_or_notify_cancel()]
+        if len(live) < len(batch):
+            self._count("cancelled", len(batch) - len(live))
+        if not live:
+            return
+        try:
+            text = self.send(batch_classification_messages([p.query for p in live]), len(live),
+                             batch_priority(live))
+            labels = parse_batch_labels(text, len(live))
+        except Exception as e:
+            for pending in live:
+                _settle(pending.future, exception=e)
+            return
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["queries"] += len(live)
+            self._stats["unparsed"] += labels.count(None)
+        for pending, label in zip(live, labels):
+            _settle(pending.future, result=label)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_batch_size"] = round(stats["queries"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", "100000"))
+SESSION_TTL = float(os.getenv("CONVERSATION_TTL", "1800"))
+MAX_TURNS = int(os.getenv("CONVERSATION_MAX_TURNS", "6"))
+TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", "400"))
+MAX_TURN_CHARS = 400
+MAX_SUMMARY_CHARS = 300
+
+
+# Rough token estimate (about four characters per token)
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+class Turn:
+    __slots__ = ("role", "text", "tokens")
+
+    def __init__(self, role, text):
+        self.role = role
+        self.text = text[:MAX_TURN_CHARS]
+        self.tokens = estimate_tokens(self.text)
+
+
+class Session:
+    __slots__ = ("turns", "summary", "last_seen")
+
+    def __init__(self, max_turns):
+        self.turns = deque(maxlen=max_turns)
+        self.summary = ""
+        self.last_seen = time.monotonic()
+
+
+# Per-phone-number conversation history. Each session keeps a ring buffer of recent turns;
+# guest messages pushed out of it are folded into a short running summary. Sessions expire
+# after the TTL and the least recently active ones are dropped beyond max_sessions, so memory
+# stays bounded by max_sessions * max_turns * MAX_TURN_CHARS.
+class ConversationStore:
+    def __init__(self, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL, max_turns=MAX_TURNS,
+                 token_budget=TOKEN_BUDGET):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - session.last_seen < self.ttl:
+                break
+            del self._sessions[key]
+
+    def _append(self, session, turn):
+        if len(session.turns) == session.turns.maxlen:
+            dropped = session.turns[0]
+            if dropped.role == "user":
+                summary = f"{session.summary}; {dropped.text}" if session.summary else dropped.text
+                session.summary = summary[-MAX_SUMMARY_CHARS:]
+        session.turns.append(turn)
+
+    def record(self, key, user_text, reply_text):
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.pop(key, None)
+            if session is None or now - session.last_seen >= self.ttl:
+                session = Session(self.max_turns)
+            self._append(session, Turn("user", user_text))
+            self._append(session, Turn("assistant", reply_text))
+            session.last_seen = now
+            self._sessions[key] = session
+            self._evict(now)
+
+    # Chat messages for the most recent turns that fit in the token budget, preceded by
+    # the summary of older guest messages when there is one
+    def messages(self, key):
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None or now - session.last_seen >= self.ttl:
+                return []
+            turns = list(session.turns)
+            summary = session.summary
+
+        budget = self.token_budget
+        window = []
+        for turn in reversed(turns):
+            if turn.tokens > budget:
+                break
+            budget -= turn.tokens
+            window.append({"role": turn.role, "content": turn.text})
+        window.reverse()
+        if summary and estimate_tokens(summary) <= budget:
+            window.insert(0, {"role": "system", "content": f"Earlier in this conversation the guest asked: {summary}"})
+        return window
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+conversation_store = ConversationStore()
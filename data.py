@@ -1,39 +1,163 @@
 import sqlite3
-import pandas as pd
+from pathlib import Path
 import streamlit as st
+from room_catalog import change_version, ensure_schema, save_rooms
+
+DB_PATH = "rooms.db"
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Keyset pagination: a page starts after the last id of the previous one, so every page
+# costs the same however deep it is
+PAGE_SQL = """
+SELECT id, title, description FROM room_data
+WHERE id > ? AND (? = '' OR title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')
+ORDER BY id LIMIT ?
+"""
+COUNT_SQL = """
+SELECT COUNT(*) FROM room_data
+WHERE ? = '' OR title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\'
+"""
 
 # Streamlit app title
 st.title("Room Database Viewer")
 
-# Function to connect to SQLite database and fetch data
-def get_data():
+# One read-only connection shared by every session; saves open their own
+@st.cache_resource
+def get_connection():
+    ensure_schema(DB_PATH)
+    uri = f"{Path(DB_PATH).resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+def like_pattern(search):
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+# Pages and counts are cached per change version, so a save anywhere invalidates them
+@st.cache_data(max_entries=256)
+def load_page(search, after_id, page_size, version):
+    pattern = like_pattern(search)
+    rows = get_connection().execute(PAGE_SQL, (after_id, search, pattern, pattern, page_size + 1)).fetchall()
+    page = [{"id": room_id, "title": title, "description": description} for room_id, title, description in rows]
+    return page[:page_size], len(page) > page_size
+
+@st.cache_data(max_entries=64)
+def count_rooms(search, version):
+    pattern = like_pattern(search)
+    return get_connection().execute(COUNT_SQL, (search, pattern, pattern)).fetchone()[0]
+
+def no_changes():
+    return {"rooms": {}, "new": {}, "deleted": set()}
+
+state = st.session_state
+state.setdefault("cursors", [0])
+# Edited rooms by id, new rooms by a per-session number, and deleted ids
+state.setdefault("pending", no_changes())
+state.setdefault("generation", 0)
+state.setdefault("new_rooms", 0)
+
+# Move the open page's edits into the batch of pending changes as soon as they are made;
+# the page is then shown with them applied under a fresh editor key. A key is folded
+# once, even when an edit and a button click arrive in the same rerun.
+def fold_edits():
+    key = state.get("editor_key")
+    delta = state.get(key)
+    if not delta or state.get("folded_key") == key:
+        return
+    state.folded_key = key
+    pending = state.pending
+    rows, sources = state.get("page_rows", []), state.get("page_sources", [])
+    for index, changes in delta.get("edited_rows", {}).items():
+        row, (kind, ref) = rows[int(index)], sources[int(index)]
+        edited = (changes.get("title", row["title"]) or "", changes.get("description", row["description"]) or "")
+        if kind == "new":
+            pending["new"][ref] = edited
+        else:
+            pending["rooms"][ref] = edited
+    for added in delta.get("added_rows", []):
+        state.new_rooms += 1
+        pending["new"][state.new_rooms] = (added.get("title") or "", added.get("description") or "")
+    for index in delta.get("deleted_rows", []):
+        kind, ref = sources[int(index)]
+        if kind == "new":
+            pending["new"].pop(ref, None)
+        else:
+            pending["deleted"].add(ref)
+            pending["rooms"].pop(ref, None)
+    state.generation += 1
+
+def go_to(cursors):
+    fold_edits()
+    state.cursors = cursors
+
+def reset_pages():
+    go_to([0])
+
+def save_changes():
+    fold_edits()
+    pending = state.pending
+    rooms = [(room_id, title, description) for room_id, (title, description) in pending["rooms"].items()]
+    rooms += [(None, title, description) for title, description in pending["new"].values()]
     try:
-        conn = sqlite3.connect("rooms.db")
-        df = pd.read_sql_query("SELECT * FROM room_data", conn)
-        conn.close()
-        return df
+        version = save_rooms(DB_PATH, rooms, pending["deleted"])
+        state.message = ("success", f"Saved {len(rooms) + len(pending['deleted'])} changes (change {version})")
+        state.pending = no_changes()
+        state.generation += 1
     except Exception as e:
-        st.error(f"Error: {e}")
-        return pd.DataFrame()
-
-# Load data
-data = get_data()
-
-# Display data in Streamlit app
-if not data.empty:
-    st.write("### Edit Room Record")
-    row = data.iloc[0]
-    title = st.text_input("Title", row["title"], key="title")
-    description = st.text_area("Description", row["description"], key="description")
-    
-    if st.button("Save Changes"):
-        try:
-            conn = sqlite3.connect("rooms.db")
-            updated_df = pd.DataFrame([{"title": title, "description": description}])
-            updated_df.to_sql("room_data", conn, if_exists="replace", index=False)
-            conn.close()
-            st.success("Database updated successfully!")
-        except Exception as e:
-            st.error(f"Error saving data: {e}")
-else:
-    st.write("No data found in the database.")
+        state.message = ("error", f"Error saving data: {e}")
+
+def discard_changes():
+    state.pending = no_changes()
+    state.generation += 1
+
+search_col, size_col = st.columns([3, 1])
+search = search_col.text_input("Search title or description", key="search", on_change=reset_pages).strip()
+page_size = size_col.selectbox("Rooms per page", PAGE_SIZES, key="page_size", on_change=reset_pages)
+
+try:
+    version = change_version(get_connection())
+    total = count_rooms(search, version)
+    page, has_more = load_page(search, state.cursors[-1], page_size, version)
+except Exception as e:
+    st.error(f"Error: {e}")
+    st.stop()
+
+# Pending edits and deletions are shown on the page until they are saved, and rooms
+# added but not saved yet at the end of the last page, where they can be edited or removed
+pending = state.pending
+rows, sources = [], []
+for row in page:
+    if row["id"] in pending["deleted"]:
+        continue
+    if row["id"] in pending["rooms"]:
+        title, description = pending["rooms"][row["id"]]
+        row = {**row, "title": title, "description": description}
+    rows.append(row)
+    sources.append(("room", row["id"]))
+if not has_more:
+    for number, (title, description) in pending["new"].items():
+        rows.append({"id": None, "title": title, "description": description})
+        sources.append(("new", number))
+state.page_rows, state.page_sources = rows, sources
+
+first = (len(state.cursors) - 1) * page_size + 1
+caption = f"Rooms {first}–{first + len(page) - 1} of {total}" if page else f"No rooms match ({total} total)"
+if pending["new"]:
+    caption += f", plus {len(pending['new'])} new (unsaved) at the end of the last page"
+st.caption(caption)
+state.editor_key = f"editor-{search}-{state.cursors[-1]}-{page_size}-{version}-{state.generation}"
+st.data_editor(rows, key=state.editor_key, num_rows="dynamic", hide_index=True, width="stretch", on_change=fold_edits,
+               disabled=["id"], column_config={"description": st.column_config.TextColumn(width="large")})
+
+prev_col, next_col = st.columns(2)
+prev_col.button("◀ Previous", disabled=len(state.cursors) == 1, on_click=go_to, args=(state.cursors[:-1],))
+next_col.button("Next ▶", disabled=not has_more, on_click=go_to,
+                args=(state.cursors + [page[-1]["id"]] if page else state.cursors,))
+
+unsaved = len(pending["rooms"]) + len(pending["new"]) + len(pending["deleted"])
+save_col, discard_col = st.columns(2)
+save_col.button(f"Save {unsaved} changes", disabled=unsaved == 0, on_click=save_changes, type="primary")
+discard_col.button("Discard changes", disabled=unsaved == 0, on_click=discard_changes)
+
+message = state.pop("message", None)
+if message:
+    getattr(st, message[0])(message[1])
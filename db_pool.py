@@ -0,0 +1,150 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+MAX_CONNECTION_AGE = float(os.getenv("DB_MAX_CONNECTION_AGE", "600"))
+HEALTH_CHECK_INTERVAL = float(os.getenv("DB_HEALTH_CHECK_INTERVAL", "30"))
+MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(64 * 1024 * 1024)))
+CACHED_STATEMENTS = 128
+
+
+class PooledConnection:
+    __slots__ = ("conn", "created_at", "last_checked")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_checked = self.created_at
+
+
+# Thread-safe pool of read-only SQLite connections
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE, max_age=MAX_CONNECTION_AGE,
+                 health_check_interval=HEALTH_CHECK_INTERVAL, mmap_size=MMAP_SIZE):
+        self.path = path
+        self.size = size
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self.mmap_size = mmap_size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._wal_checked = False
+        self._stats = {"checkouts": 0, "opened": 0, "recycled": 0, "failed_health_checks": 0}
+
+    # WAL lets the bots keep reading while the editor writes; it is persisted in the file
+    def _ensure_wal(self):
+        try:
+            conn = sqlite3.connect(self.path)
+            try:
+                mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            finally:
+                conn.close()
+            if mode != "wal":
+                logger.warning(f"Could not enable WAL on {self.path}, journal mode is {mode}")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not enable WAL on {self.path}: {e}")
+        self._wal_checked = True
+
+    def _open(self):
+        uri = f"{Path(self.path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                               cached_statements=CACHED_STATEMENTS)
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA query_only=ON")
+        with self._lock:
+            self._stats["opened"] += 1
+        return PooledConnection(conn)
+
+    def _discard(self, pooled):
+        try:
+            pooled.conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def _healthy(self, pooled):
+        now = time.monotonic()
+        if now - pooled.created_at > self.max_age:
+            with self._lock:
+                self._stats["recycled"] += 1
+            return False
+        if now - pooled.last_checked > self.health_check_interval:
+            try:
+                pooled.conn.execute("SELECT 1").fetchone()
+            except sqlite3.Error:
+                with self._lock:
+                    self._stats["failed_health_checks"] += 1
+                return False
+            pooled.last_checked = now
+        return True
+
+    def acquire(self, timeout=5.0):
+        if not self._wal_checked:
+            self._ensure_wal()
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._opened < self.size
+                    if can_open:
+                        self._opened += 1
+                if can_open:
+                    try:
+                        pooled = self._open()
+                    except sqlite3.Error:
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+                else:
+                    try:
+                        pooled = self._idle.get(timeout=timeout)
+                    except queue.Empty:
+                        raise TimeoutError(f"No database connection free after {timeout}s")
+            if self._healthy(pooled):
+                with self._lock:
+                    self._stats["checkouts"] += 1
+                return pooled
+            self._discard(pooled)
+
+    def release(self, pooled, broken=False):
+        if broken:
+            self._discard(pooled)
+        else:
+            self._idle.put(pooled)
+
+    @contextmanager
+    def connection(self):
+        pooled = self.acquire()
+        broken = False
+        try:
+            yield pooled.conn
+        except sqlite3.Error:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open"] = self._opened
+        stats["idle"] = self._idle.qsize()
+        return stats
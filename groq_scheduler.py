@@ -0,0 +1,308 @@
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+logger = logging.getLogger(__name__)
+
+INITIAL_CONCURRENCY = float(os.getenv("SCHEDULER_INITIAL_CONCURRENCY", "8"))
+MIN_CONCURRENCY = float(os.getenv("SCHEDULER_MIN_CONCURRENCY", "1"))
+MAX_CONCURRENCY = float(os.getenv("SCHEDULER_MAX_CONCURRENCY", "64"))
+QUEUE_TIMEOUT = float(os.getenv("SCHEDULER_QUEUE_TIMEOUT", "10"))
+# Stop dispatching when the remaining requests/tokens in the window fall below these
+REQUEST_RESERVE = int(os.getenv("SCHEDULER_REQUEST_RESERVE", "1"))
+TOKEN_RESERVE = int(os.getenv("SCHEDULER_TOKEN_RESERVE", "1000"))
+# The Groq clients don't retry; failed calls queue again here so every 429 reaches the limit
+MAX_RETRIES = int(os.getenv("SCHEDULER_MAX_RETRIES", "2"))
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 8.0
+# Statuses the Groq SDK retries by default, plus every 5xx
+RETRY_STATUSES = {408, 409, 429}
+
+# Priority lanes, lower runs first
+PRIORITY_WHATSAPP_BOOKING = 0
+PRIORITY_WHATSAPP = 1
+PRIORITY_WEB_BOOKING = 2
+PRIORITY_WEB = 3
+
+current_channel = contextvars.ContextVar("current_channel", default="web")
+
+
+class SchedulerOverloaded(Exception):
+    pass
+
+
+# Mark the calls made inside the block as coming from a channel ("web" or "whatsapp")
+@contextmanager
+def request_channel(name):
+    token = current_channel.set(name)
+    try:
+        yield
+    finally:
+        current_channel.reset(token)
+
+
+def priority_for(query_type=None):
+    booking = query_type == "1"
+    if current_channel.get() == "whatsapp":
+        return PRIORITY_WHATSAPP_BOOKING if booking else PRIORITY_WHATSAPP
+    return PRIORITY_WEB_BOOKING if booking else PRIORITY_WEB
+
+
+# Groq reset headers look like "7.66s", "2m59.56s" or "120ms"
+def parse_duration(value):
+    if not value:
+        return None
+    units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    return sum(float(number) * units[unit] for number, unit in parts) if parts else None
+
+
+# Connection failures and timeouts carry no status code
+def _retryable(error):
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRY_STATUSES or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def _header_int(headers, name):
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+class Waiter:
+    __slots__ = ("priority", "seq", "event", "future", "loop", "granted", "cancelled")
+
+    def __init__(self, priority, seq):
+        self.priority = priority
+        self.seq = seq
+        self.event = None
+        self.future = None
+        self.loop = None
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(True)
+
+
+# One in-flight Groq call; feed it the response headers so the scheduler can track limits
+class Slot:
+    __slots__ = ("scheduler", "headers")
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.headers = None
+
+    def observe(self, headers):
+        self.headers = headers
+
+
+# Central admission control for Groq calls, shared by the sync and async code paths.
+# Calls wait in priority lanes; concurrency adapts AIMD-style (grows by 1/limit per success,
+# halves on a 429) and dispatch pauses while the rate-limit headers say the window is spent.
+# Calls still queued when their deadline passes are shed with SchedulerOverloaded.
+class RateLimitScheduler:
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=MIN_CONCURRENCY, maximum=MAX_CONCURRENCY,
+                 queue_timeout=QUEUE_TIMEOUT):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.remaining_requests = None
+        self.remaining_tokens = None
+        self._paused_until = 0.0
+        self._timer = None
+        self._waiters = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"dispatched": 0, "shed": 0, "rate_limited": 0, "retried": 0}
+
+    def _dispatch(self):
+        now = time.monotonic()
+        if now < self._paused_until:
+            self._schedule_resume(self._paused_until - now)
+            return
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self.in_flight += 1
+            self._stats["dispatched"] += 1
+            waiter.wake()
+
+    def _schedule_resume(self, delay):
+        if self._timer is not None and self._timer.is_alive():
+            return
+        self._timer = threading.Timer(delay, self._resume)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _resume(self):
+        with self._lock:
+            self._timer = None
+            self._dispatch()
+
+    def _enqueue(self, waiter):
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+            self._dispatch()
+
+    # Give up on a waiter; returns True if it was granted in the meantime and must be used
+    def _abandon(self, waiter):
+        with self._lock:
+            if waiter.granted:
+                return True
+            waiter.cancelled = True
+            self._stats["shed"] += 1
+            return False
+
+    def _pause(self, seconds):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    # `error` is the exception the call failed with; cancelled calls leave the limit alone
+    def _release(self, slot, error=None, cancelled=False):
+        headers = slot.headers
+        if error is not None and getattr(error, "status_code", None) == 429:
+            headers = getattr(getattr(error, "response", None), "headers", None)
+        with self._lock:
+            self.in_flight -= 1
+            if headers is not None:
+                self.remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+                self.remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+                if self.remaining_requests is not None and self.remaining_requests <= REQUEST_RESERVE:
+                    self._pause(parse_duration(headers.get("x-ratelimit-reset-requests")) or 1.0)
+                if self.remaining_tokens is not None and self.remaining_tokens <= TOKEN_RESERVE:
+                    self._pause(parse_duration(headers.get("x-ratelimit-reset-tokens")) or 1.0)
+            if error is not None and getattr(error, "status_code", None) == 429:
+                self._stats["rate_limited"] += 1
+                self.limit = max(self.minimum, self.limit / 2)
+                retry_after = headers.get("retry-after") if headers is not None else None
+                self._pause(float(retry_after) if retry_after else 1.0)
+                logger.warning(f"Groq rate limited, concurrency limit now {self.limit:.1f}")
+            elif error is None and not cancelled:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, priority, timeout=None):
+        waiter = Waiter(priority, next(self._seq))
+        waiter.event = threading.Event()
+        self._enqueue(waiter)
+        if not waiter.event.wait(self.queue_timeout if timeout is None else timeout):
+            if not self._abandon(waiter):
+                raise SchedulerOverloaded("Groq request queue deadline passed")
+        slot = Slot(self)
+        try:
+            yield slot
+        except Exception as e:
+            self._release(slot, e)
+            raise
+        except BaseException:
+            # A streaming generator closed mid-stream raises GeneratorExit here
+            self._release(slot, cancelled=True)
+            raise
+        self._release(slot)
+
+    @asynccontextmanager
+    async def slot_async(self, priority, timeout=None):
+        import asyncio  # imported here so the Flask apps don't load it at startup
+        waiter = Waiter(priority, next(self._seq))
+        waiter.loop = asyncio.get_running_loop()
+        waiter.future = waiter.loop.create_future()
+        self._enqueue(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                raise SchedulerOverloaded("Groq request queue deadline passed")
+        except asyncio.CancelledError:
+            if self._abandon(waiter):
+                self._release(Slot(self), cancelled=True)
+            raise
+        slot = Slot(self)
+        try:
+            yield slot
+        except Exception as e:
+            self._release(slot, e)
+            raise
+        except BaseException:
+            self._release(slot, cancelled=True)
+            raise
+        self._release(slot)
+
+    # Seconds to wait before attempt `attempt + 1` of a call that failed with `error`, or
+    # None when it should not be retried. A 429 has already paused dispatch for its
+    # retry-after when the slot was released, so it queues again straight away.
+    def retry_delay(self, error, attempt, retries=MAX_RETRIES):
+        if attempt >= retries or not _retryable(error):
+            return None
+        with self._lock:
+            self._stats["retried"] += 1
+        if getattr(error, "status_code", None) == 429:
+            return 0.0
+        return min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    # Runs `fn(slot)` in a slot of the given lane, queueing again after a retryable error
+    def call(self, priority, fn, retries=MAX_RETRIES):
+        for attempt in itertools.count():
+            try:
+                with self.slot(priority) as slot:
+                    return fn(slot)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt, retries)
+                if delay is None:
+                    raise
+                logger.info(f"Retrying Groq call after {type(e).__name__} (attempt {attempt + 1})")
+                time.sleep(delay)
+
+    async def call_async(self, priority, fn, retries=MAX_RETRIES):
+        import asyncio  # imported here so the Flask apps don't load it at startup
+        for attempt in itertools.count():
+            try:
+                async with self.slot_async(priority) as slot:
+                    return await fn(slot)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt, retries)
+                if delay is None:
+                    raise
+                logger.info(f"Retrying Groq call after {type(e).__name__} (attempt {attempt + 1})")
+                await asyncio.sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": sum(1 for waiter in self._waiters if not waiter.cancelled),
+                "remaining_requests": self.remaining_requests,
+                "remaining_tokens": self.remaining_tokens,
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            })
+        return stats
+
+
+groq_scheduler = RateLimitScheduler()
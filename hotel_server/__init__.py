@@ -0,0 +1,89 @@
+from flask import Flask, Response, g, request, jsonify
+import importlib
+import logging
+import time
+import metrics
+import tracing
+from chatbot import classify_batcher, room_availability, room_store, start_groq_keepalive
+from classifier import fast_classifier
+from groq_scheduler import groq_scheduler
+from model_router import model_router
+from response_cache import response_cache
+from hotel_server.config import CHANNELS
+
+logger = logging.getLogger(__name__)
+
+HOME_TEXT = "Maya is up and running!"
+
+
+# Imports the module of each enabled channel; each has a blueprint named after the
+# channel and a stats() function
+def load_channels(channels=CHANNELS):
+    return [importlib.import_module(f"hotel_server.{channel}") for channel in sorted(channels)]
+
+# The /stats payload, shared by the Flask and ASGI apps
+def server_stats(channels, modules):
+    data = {
+        "channels": sorted(channels),
+        "classifier": fast_classifier.stats(),
+        "response_cache": response_cache.stats(),
+        "models": model_router.stats(),
+        "scheduler": groq_scheduler.stats(),
+        "classify_batcher": classify_batcher.stats() if classify_batcher else None,
+        "availability": room_availability.stats(),
+        "rooms": room_store.stats(),
+    }
+    for module in modules:
+        data.update(module.stats())
+    return data
+
+# Request counts and latency per route for /metrics, and a trace whose stage timings
+# come back in the Server-Timing header. begin_request returns the start time to pass
+# to end_request.
+def begin_request(path, headers):
+    tracing.begin(path, headers.get(tracing.TRACE_HEADER))
+    return time.perf_counter()
+
+def end_request(url_rule, response, start):
+    endpoint = url_rule.rule if url_rule else "unmatched"
+    metrics.record_request(endpoint, response.status_code, time.perf_counter() - start)
+    return tracing.attach(response)
+
+
+# One Flask app for the web and WhatsApp channels. Channel modules are only imported
+# when enabled, so a web-only process never opens the webhook dedup database.
+def create_app(channels=CHANNELS):
+    app = Flask(__name__)
+
+    # Set up logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # Open Groq connections now so the first guest doesn't pay the TLS handshake
+    start_groq_keepalive()
+
+    modules = load_channels(channels)
+    for module, channel in zip(modules, sorted(channels)):
+        app.register_blueprint(getattr(module, channel))
+    logger.info(f"Serving channels: {', '.join(sorted(channels)) or 'none'}")
+
+    @app.before_request
+    def start_request():
+        g.request_start = begin_request(request.path, request.headers)
+
+    @app.after_request
+    def finish_request(response):
+        return end_request(request.url_rule, response, g.request_start)
+
+    @app.route('/stats', methods=['GET'])
+    def stats():
+        return jsonify(server_stats(channels, modules))
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics_endpoint():
+        return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+    @app.route('/')
+    def home():
+        return HOME_TEXT
+
+    return app
@@ -0,0 +1,12 @@
+import os
+
+KNOWN_CHANNELS = ("web", "whatsapp")
+
+# Channels served by this process: "web" is /query and /query/stream, "whatsapp" is
+# /twilio_webhook. One process serving both shares the Groq clients, the room DB pool
+# and every cache.
+CHANNELS = frozenset(c.strip() for c in os.getenv("SERVE_CHANNELS", "web,whatsapp").split(",") if c.strip())
+
+unknown = CHANNELS - set(KNOWN_CHANNELS)
+if unknown:
+    raise ValueError(f"Unknown SERVE_CHANNELS entries: {', '.join(sorted(unknown))}")
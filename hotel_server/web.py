@@ -0,0 +1,64 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+import json
+import time
+from chatbot import answer_query, stream_answer
+from groq_scheduler import SchedulerOverloaded
+
+web = Blueprint("web", __name__)
+
+# Error bodies of the web endpoints, shared with the ASGI app
+MISSING_QUERY_ERROR = {"error": "Query parameter is required"}
+BUSY_ERROR = {"error": "Server busy, please retry"}
+UNCLASSIFIED_ERROR = {"error": "Invalid query classification"}
+
+
+@web.route('/query', methods=['GET'])
+def handle_query():
+    query = request.args.get('query')
+    if not query:
+        return jsonify(MISSING_QUERY_ERROR), 400
+
+    try:
+        response = answer_query(query)
+    except SchedulerOverloaded:
+        return jsonify(BUSY_ERROR), 503
+    if response is None:
+        return jsonify(UNCLASSIFIED_ERROR), 500
+
+    return jsonify({"response": response})
+
+# Streams the answer as Server-Sent Events; the first token is awaited before the
+# response starts so its latency can be sent in the X-Time-To-First-Token header.
+@web.route('/query/stream', methods=['GET'])
+def handle_query_stream():
+    query = request.args.get('query')
+    if not query:
+        return jsonify(MISSING_QUERY_ERROR), 400
+
+    start = time.perf_counter()
+    try:
+        tokens = stream_answer(query)
+        if tokens is None:
+            return jsonify(UNCLASSIFIED_ERROR), 500
+        first_token = next(tokens, "")
+    except SchedulerOverloaded:
+        return jsonify(BUSY_ERROR), 503
+    ttft_ms = (time.perf_counter() - start) * 1000
+
+    def events():
+        yield f"data: {json.dumps({'token': first_token})}\n\n"
+        for token in tokens:
+            yield f"data: {json.dumps({'token': token})}\n\n"
+        total_ms = (time.perf_counter() - start) * 1000
+        yield f"event: done\ndata: {json.dumps({'ttft_ms': round(ttft_ms, 1), 'total_ms': round(total_ms, 1)})}\n\n"
+
+    headers = {
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+        'X-Time-To-First-Token': f"{ttft_ms:.1f}",
+    }
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers=headers)
+
+
+def stats():
+    return {}
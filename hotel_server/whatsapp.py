@@ -0,0 +1,82 @@
+from flask import Blueprint, request
+import logging
+import metrics
+from chatbot import answer_query
+from conversations import conversation_store
+from groq_scheduler import SchedulerOverloaded, request_channel
+from webhook_dedup import WebhookDeduplicator
+from whatsapp_delivery import REPLY_MODE, DeliveryQueue
+
+logger = logging.getLogger(__name__)
+
+whatsapp = Blueprint("whatsapp", __name__)
+
+UNCLASSIFIED_REPLY = "Sorry, I couldn't understand your request."
+BUSY_REPLY = "Sorry, we're a little busy right now. Please try again in a moment."
+MISSING_FIELDS_TWIML = "<Response><Message>Error: Phone number and message are required.</Message></Response>"
+XML_HEADERS = {'Content-Type': 'application/xml'}
+
+
+# Answer a WhatsApp message in the context of the guest's conversation, falling back
+# to an apology when it can't be classified or Groq is saturated
+def whatsapp_reply(message_body, phone_number):
+    try:
+        with request_channel("whatsapp"):
+            response_text = answer_query(message_body, history=conversation_store.messages(phone_number))
+    except SchedulerOverloaded:
+        return BUSY_REPLY
+    return finish_reply(message_body, phone_number, response_text)
+
+# The reply to send for an answer (None when the message couldn't be classified); answered
+# messages are added to the guest's conversation. Shared with the ASGI webhook.
+def finish_reply(message_body, phone_number, response_text):
+    if response_text is None:
+        return UNCLASSIFIED_REPLY
+    conversation_store.record(phone_number, message_body, response_text)
+    return response_text
+
+# Build the TwiML for a WhatsApp message. In async mode acknowledge right away and let
+# the delivery workers send the reply.
+def render_webhook_reply(phone_number, message_body, reply_from):
+    if REPLY_MODE == "async" and delivery_queue.submit(phone_number, message_body, reply_from):
+        return twiml_message()
+
+    return twiml_message(whatsapp_reply(message_body, phone_number))
+
+# TwiML for an optional reply; twilio.twiml is imported on first use, off the startup path
+def twiml_message(text=None):
+    with metrics.stage("twiml_render"):
+        from twilio.twiml.messaging_response import MessagingResponse
+        response = MessagingResponse()
+        if text is not None:
+            response.message(text)
+        return str(response)
+
+delivery_queue = DeliveryQueue(whatsapp_reply)
+webhook_dedup = WebhookDeduplicator()
+
+# Twilio webhook for handling WhatsApp messages
+@whatsapp.route('/twilio_webhook', methods=['POST'])
+def twilio_webhook():
+    phone_number = request.form.get('From')
+    message_body = request.form.get('Body')
+
+    if not phone_number or not message_body:
+        return MISSING_FIELDS_TWIML, 400, XML_HEADERS
+
+    logger.info(f"Received WhatsApp message from {phone_number}: {message_body}")
+
+    # Twilio retries slow webhooks with the same MessageSid; answer each message only once
+    reply_from = request.form.get('To')
+    twiml = webhook_dedup.run(request.form.get('MessageSid'),
+                              lambda: render_webhook_reply(phone_number, message_body, reply_from))
+
+    return twiml, 200, XML_HEADERS
+
+
+def stats():
+    return {
+        "whatsapp_delivery": delivery_queue.stats(),
+        "webhook_dedup": webhook_dedup.stats(),
+        "conversation_sessions": len(conversation_store),
+    }
@@ -0,0 +1,271 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# With several worker processes (gunicorn, hypercorn --workers) point every worker at the
+# same directory: each writes its own snapshot file and /metrics sums all of them.
+# Empty the directory when the service is (re)deployed.
+METRICS_DIR = os.getenv("METRICS_DIR")
+FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached answer (sub-millisecond) up to a slow two-call completion
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+# Monotonic counter with a fixed set of label names
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def series(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    @staticmethod
+    def merge(a, b):
+        return a + b
+
+    def lines(self, series):
+        for key, value in series:
+            yield f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"
+
+
+# Fixed-bucket histogram; each observation is one bisect and one increment under a lock
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def series(self):
+        with self._lock:
+            return [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self._values.items()]
+
+    @staticmethod
+    def merge(a, b):
+        return [[x + y for x, y in zip(a[0], b[0])], a[1] + b[1], a[2] + b[2]]
+
+    def lines(self, series):
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = format_labels(self.labelnames, key, [("le", format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+# Holds every metric of the process and renders them in the Prometheus text format,
+# summed over all worker processes when METRICS_DIR is set
+class Registry:
+    def __init__(self, directory=METRICS_DIR, flush_interval=FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self.flush)
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.series() for metric in metrics}
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+
+    # Atomically replace this process's snapshot file
+    def flush(self):
+        if not self.directory:
+            return
+        path = self.snapshot_path
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, path)
+        except OSError:
+            logger.exception(f"Could not write metrics snapshot {path}")
+
+    # Periodic flush so other workers' /metrics see this process between scrapes; started
+    # lazily so it runs in each forked worker rather than in a preloading parent
+    def start_flusher(self):
+        with self._lock:
+            if not self.directory or self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+
+        def loop():
+            while True:
+                time.sleep(self.flush_interval)
+                self.flush()
+
+        threading.Thread(target=loop, name="metrics-flush", daemon=True).start()
+
+    def collect(self):
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        merged = {}
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, series in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged.setdefault(name, {})
+                for key, value in series:
+                    key = tuple(key)
+                    target[key] = metric.merge(target[key], value) if key in target else value
+        return {name: [[list(key), value] for key, value in series.items()] for name, series in merged.items()}
+
+    def render(self):
+        self.start_flusher()
+        collected = self.collect()
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.lines(sorted(collected.get(metric.name, []))))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+STAGE_SECONDS = registry.histogram(
+    "chatbot_stage_duration_seconds", "Time spent in each stage of answering a query", ["stage"])
+LLM_CALL_SECONDS = registry.histogram(
+    "chatbot_llm_call_duration_seconds", "Groq completion latency", ["task", "model"])
+LLM_TOKENS = registry.counter(
+    "chatbot_llm_tokens_total", "Tokens used by Groq completions", ["task", "model", "kind"])
+QUERIES = registry.counter(
+    "chatbot_queries_total", "Answered queries by query type", ["query_type"])
+ERRORS = registry.counter(
+    "chatbot_errors_total", "Exceptions raised by a stage", ["stage", "error"])
+HTTP_REQUESTS = registry.counter(
+    "chatbot_http_requests_total", "HTTP requests by endpoint and status", ["endpoint", "status"])
+HTTP_SECONDS = registry.histogram(
+    "chatbot_http_request_duration_seconds", "Time to produce the HTTP response", ["endpoint"])
+
+# Label values of chatbot_queries_total; anything else the classifier returns (free text
+# from the LLM) is counted as "unclassified" so the label stays bounded
+QUERY_TYPE_NAMES = {"1": "booking", "2": "info", "cached": "cached", "single_shot": "single_shot"}
+
+
+# Times a stage, counts the exception type when it fails and adds a span to the
+# current request's trace
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        ERRORS.inc(stage=name, error=type(e).__name__)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_SECONDS.observe(duration, stage=name)
+        tracing.record(name, start, duration)
+
+
+def record_query(query_type):
+    QUERIES.inc(query_type=QUERY_TYPE_NAMES.get(query_type, "unclassified"))
+
+
+def record_llm_call(task, model, latency, usage=None):
+    LLM_CALL_SECONDS.observe(latency, task=task, model=model)
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, task=task, model=model, kind="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, task=task, model=model, kind="completion")
+
+
+def record_request(endpoint, status, seconds):
+    registry.start_flusher()
+    HTTP_REQUESTS.inc(endpoint=endpoint, status=status)
+    HTTP_SECONDS.observe(seconds, endpoint=endpoint)
@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from classifier import fast_classifier
+
+logger = logging.getLogger(__name__)
+
+ROUTES_FILE = os.getenv("MODEL_ROUTES_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_routes.json"))
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+
+# Picks a Groq model per task and query. Each task starts on its configured model and
+# escalates to `escalate_to` for long queries, queries the local classifier is unsure
+# about, configured query types or conversations with history.
+class ModelRouter:
+    def __init__(self, routes):
+        self.models = routes.get("models", {})
+        self.tasks = routes.get("tasks", {})
+        self._lock = threading.Lock()
+        self._usage = defaultdict(lambda: {"calls": 0, "latency": 0.0, "prompt_tokens": 0, "completion_tokens": 0})
+
+    @classmethod
+    def from_file(cls, path=ROUTES_FILE):
+        try:
+            with open(path) as f:
+                return cls(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load model routes from {path} ({e}), using {DEFAULT_MODEL} everywhere")
+            return cls({})
+
+    def _resolve(self, name):
+        return self.models.get(name, name) if name else DEFAULT_MODEL
+
+    def escalation(self, task):
+        route = self.tasks.get(task, {})
+        return self._resolve(route.get("escalate_to") or route.get("model"))
+
+    def choose(self, task, query="", query_type=None, history=()):
+        route = self.tasks.get(task)
+        if not route:
+            return DEFAULT_MODEL
+        reasons = []
+        max_words = route.get("max_query_words")
+        if max_words and len(query.split()) > max_words:
+            reasons.append("long query")
+        min_confidence = route.get("min_confidence")
+        if min_confidence and fast_classifier.predict(query)[1] < min_confidence:
+            reasons.append("low confidence")
+        if query_type in route.get("escalate_query_types", ()):
+            reasons.append(f"query type {query_type}")
+        if history and route.get("escalate_with_history"):
+            reasons.append("conversation history")
+        if reasons and route.get("escalate_to"):
+            logger.debug(f"Escalating {task} to {route['escalate_to']}: {', '.join(reasons)}")
+            return self._resolve(route["escalate_to"])
+        return self._resolve(route.get("model"))
+
+    def record(self, task, model, latency, usage=None):
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        with self._lock:
+            stats = self._usage[model]
+            stats["calls"] += 1
+            stats["latency"] += latency
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+        logger.info(f"{task} on {model}: {latency * 1000:.0f} ms, "
+                    f"{prompt_tokens} prompt + {completion_tokens} completion tokens")
+
+    def stats(self):
+        with self._lock:
+            usage = {model: dict(stats) for model, stats in self._usage.items()}
+        for stats in usage.values():
+            stats["avg_latency_ms"] = round(stats.pop("latency") / stats["calls"] * 1000, 1)
+        return usage
+
+
+model_router = ModelRouter.from_file()
@@ -0,0 +1,184 @@
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from availability import ensure_schema
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = 'rooms.db'
+MAX_ATTEMPTS = int(os.getenv("RESERVATION_MAX_ATTEMPTS", "50"))
+BACKOFF_BASE = float(os.getenv("RESERVATION_BACKOFF_BASE", "0.001"))
+BACKOFF_MAX = float(os.getenv("RESERVATION_BACKOFF_MAX", "0.05"))
+# How long SQLite itself waits for the write lock before reporting SQLITE_BUSY
+BUSY_TIMEOUT = float(os.getenv("RESERVATION_BUSY_TIMEOUT", "0.05"))
+
+ROOM_VERSION_SQL = "SELECT version FROM rooms WHERE id = ?"
+ROOM_IDS_SQL = "SELECT id FROM rooms ORDER BY id"
+ROOM_IDS_BY_DESCRIPTION_SQL = "SELECT id FROM rooms WHERE description = ? ORDER BY id"
+CONFLICT_SQL = "SELECT 1 FROM bookings WHERE room_id = ? AND check_out > ? AND check_in < ? LIMIT 1"
+BUMP_VERSION_SQL = "UPDATE rooms SET version = version + 1 WHERE id = ? AND version = ?"
+INSERT_BOOKING_SQL = "INSERT INTO bookings (room_id, check_in, check_out, guest) VALUES (?, ?, ?, ?)"
+TOUCH_ROOM_SQL = "UPDATE rooms SET version = version + 1 WHERE id = ?"
+BOOKING_ROOM_SQL = "SELECT room_id FROM bookings WHERE id = ?"
+DELETE_BOOKING_SQL = "DELETE FROM bookings WHERE id = ?"
+
+BUSY_CODES = (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+# Returned by an attempt whose room version moved; the attempt is retried
+RETRY = object()
+
+
+class RoomUnavailable(Exception):
+    pass
+
+
+class ReservationBusy(Exception):
+    pass
+
+
+def is_busy(error):
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xff in BUSY_CODES
+    return "locked" in str(error) or "busy" in str(error)
+
+
+# Books rooms without double-booking, across threads and worker processes. An attempt
+# reads the room's version and checks for overlapping stays without holding a lock, then
+# writes in a short BEGIN IMMEDIATE transaction that only goes through if the version is
+# unchanged. A moved version means another booking for that room committed in between,
+# so the attempt starts over; SQLITE_BUSY is retried with jittered exponential backoff.
+class ReservationService:
+    def __init__(self, path=DB_PATH, max_attempts=MAX_ATTEMPTS, backoff_base=BACKOFF_BASE,
+                 backoff_max=BACKOFF_MAX, busy_timeout=BUSY_TIMEOUT):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._schema_checked = False
+        self._lock = threading.Lock()
+        self._stats = {"booked": 0, "unavailable": 0, "cancelled": 0, "version_conflicts": 0,
+                       "busy_retries": 0, "gave_up": 0}
+
+    # One autocommit connection per thread, so transactions are started explicitly
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._lock:
+                if not self._schema_checked:
+                    ensure_schema(self.path)
+                    self._schema_checked = True
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # An attempt may roll back early itself, e.g. after a version conflict
+    @contextmanager
+    def _transaction(self, conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        if conn.in_transaction:
+            conn.execute("COMMIT")
+
+    def _backoff(self, attempt):
+        time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+    def _run(self, attempt_fn, action):
+        conn = self._connection()
+        for attempt in range(self.max_attempts):
+            try:
+                result = attempt_fn(conn)
+            except sqlite3.OperationalError as e:
+                if not is_busy(e):
+                    raise
+                self._count("busy_retries")
+            else:
+                if result is not RETRY:
+                    return result
+                self._count("version_conflicts")
+            self._backoff(attempt)
+        self._count("gave_up")
+        raise ReservationBusy(f"Could not {action} after {self.max_attempts} attempts")
+
+    def _book(self, room_id, check_in, check_out, guest):
+        if check_in >= check_out:
+            raise ValueError("check_out must be after check_in")
+        stay = (check_in.isoformat(), check_out.isoformat())
+
+        def attempt(conn):
+            row = conn.execute(ROOM_VERSION_SQL, (room_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"No room with id {room_id}")
+            if conn.execute(CONFLICT_SQL, (room_id, stay[0], stay[1])).fetchone():
+                raise RoomUnavailable(f"Room {room_id} is booked between {stay[0]} and {stay[1]}")
+            with self._transaction(conn):
+                if conn.execute(BUMP_VERSION_SQL, (room_id, row[0])).rowcount == 0:
+                    conn.execute("ROLLBACK")
+                    return RETRY
+                return conn.execute(INSERT_BOOKING_SQL, (room_id, *stay, guest)).lastrowid
+
+        booking_id = self._run(attempt, f"book room {room_id}")
+        self._count("booked")
+        logger.info(f"Booked room {room_id} from {stay[0]} to {stay[1]} (booking {booking_id})")
+        return booking_id
+
+    # Book `room_id` for the nights from check_in up to (not including) check_out;
+    # returns the booking id or raises RoomUnavailable
+    def book(self, room_id, check_in, check_out, guest=None):
+        try:
+            return self._book(room_id, check_in, check_out, guest)
+        except RoomUnavailable:
+            self._count("unavailable")
+            raise
+
+    # Book the first room (optionally of one description) free for the stay; returns
+    # (booking_id, room_id) or raises RoomUnavailable
+    def book_any(self, check_in, check_out, guest=None, description=None):
+        conn = self._connection()
+        if description is None:
+            room_ids = [row[0] for row in conn.execute(ROOM_IDS_SQL)]
+        else:
+            room_ids = [row[0] for row in conn.execute(ROOM_IDS_BY_DESCRIPTION_SQL, (description,))]
+        for room_id in room_ids:
+            try:
+                return self._book(room_id, check_in, check_out, guest), room_id
+            except RoomUnavailable:
+                continue
+        self._count("unavailable")
+        raise RoomUnavailable(f"No room free between {check_in} and {check_out}")
+
+    # Returns False when there is no such booking
+    def cancel(self, booking_id):
+        def attempt(conn):
+            with self._transaction(conn):
+                row = conn.execute(BOOKING_ROOM_SQL, (booking_id,)).fetchone()
+                if row is None:
+                    return False
+                conn.execute(DELETE_BOOKING_SQL, (booking_id,))
+                conn.execute(TOUCH_ROOM_SQL, (row[0],))
+                return True
+
+        cancelled = self._run(attempt, f"cancel booking {booking_id}")
+        if cancelled:
+            self._count("cancelled")
+        return cancelled
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
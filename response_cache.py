@@ -0,0 +1,170 @@
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+SIMILARITY_THRESHOLD = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.85"))
+VECTOR_BUCKETS = 2 ** 16
+
+# Words that do not change what a guest is asking for
+FILLER_WORDS = {
+    "a", "an", "the", "is", "are", "there", "do", "does", "you", "u", "have", "has",
+    "any", "please", "pls", "can", "could", "i", "we", "get", "your", "hotel", "at",
+    "available", "offer", "provide", "tell", "me", "about", "hi", "hello", "hey", "thanks",
+}
+# Words that flip the meaning of a question; like numbers they must match exactly
+NEGATION_WORDS = {"no", "not", "without", "never", "none", "nothing"}
+CONTRACTIONS = [(r"\bcan'?t\b", "can not"), (r"\bcannot\b", "can not"), (r"\bwon'?t\b", "will not"),
+                (r"n't\b", " not")]
+
+
+# Lower-case, drop punctuation and filler words so trivial rephrasings share one key
+def normalize(query):
+    text = query.lower().replace("wi-fi", "wifi").replace("\u2019", "'")
+    for pattern, replacement in CONTRACTIONS:
+        text = re.sub(pattern, replacement, text)
+    tokens = re.findall(r"[a-z0-9]+", text)
+    return " ".join(token for token in tokens if token not in FILLER_WORDS)
+
+
+# Numbers and negations of a normalized query; a similar match must agree on all of them
+def must_match(normalized):
+    return {token for token in normalized.split() if token.isdigit() or token in NEGATION_WORDS}
+
+
+# Hashed character-trigram vector of a normalized query, L2-normalized and sparse
+def embed(normalized):
+    text = f" {normalized} "
+    weights = {}
+    for i in range(len(text) - 2):
+        bucket = zlib.crc32(text[i:i + 3].encode()) % VECTOR_BUCKETS
+        weights[bucket] = weights.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {bucket: w / norm for bucket, w in weights.items()}
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(bucket, 0.0) for bucket, w in a.items())
+
+
+class CacheEntry:
+    __slots__ = ("response", "vector", "must_match", "expires_at", "latency", "uses_rooms")
+
+    def __init__(self, response, vector, must_match, expires_at, latency, uses_rooms):
+        self.response = response
+        self.vector = vector
+        self.must_match = must_match
+        self.expires_at = expires_at
+        self.latency = latency
+        self.uses_rooms = uses_rooms
+
+
+# LRU + TTL cache of answers, matched exactly on the normalized query or by similarity.
+# The context version is (hotel info version, room data version): a new hotel info
+# version clears the cache, a new room version only drops answers built from room details.
+class ResponseCache:
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL, threshold=SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0,
+                       "evictions": 0, "invalidations": 0, "invalidated_entries": 0, "latency_saved": 0.0}
+
+    def _check_version(self, version):
+        if version == self._version:
+            return
+        if self._entries:
+            self._stats["invalidations"] += 1
+            if self._version is None or version[0] != self._version[0]:
+                stale = list(self._entries)
+                logger.info("Hotel info changed, clearing response cache")
+            else:
+                stale = [key for key, entry in self._entries.items() if entry.uses_rooms]
+                logger.info(f"Room data changed, dropping {len(stale)} cached answers that used it")
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidated_entries"] += len(stale)
+        self._version = version
+
+    def get(self, query, version):
+        if self.max_entries <= 0:
+            return None
+        key = normalize(query)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            kind = "exact_hits"
+            if entry is None or entry.expires_at <= now:
+                entry, kind = self._find_similar(key, now), "similar_hits"
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if kind == "exact_hits":
+                self._entries.move_to_end(key)
+            self._stats[kind] += 1
+            self._stats["latency_saved"] += entry.latency
+            return entry.response
+
+    def _find_similar(self, key, now):
+        vector = embed(key)
+        required = must_match(key)
+        best, best_score = None, self.threshold
+        for other_key, entry in list(self._entries.items()):
+            if entry.expires_at <= now:
+                del self._entries[other_key]
+                continue
+            if entry.must_match != required:
+                continue
+            score = cosine(vector, entry.vector)
+            if score >= best_score:
+                best, best_score = other_key, score
+        if best is None:
+            return None
+        self._entries.move_to_end(best)
+        return self._entries[best]
+
+    # `uses_rooms` is False for answers that only used the hotel info
+    def put(self, query, version, response, latency=0.0, uses_rooms=True):
+        if self.max_entries <= 0:
+            return
+        key = normalize(query)
+        entry = CacheEntry(response, embed(key), must_match(key),
+                           time.monotonic() + self.ttl, latency, uses_rooms)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        hits = stats["exact_hits"] + stats["similar_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = hits / lookups if lookups else 0.0
+        stats["latency_saved_ms"] = round(stats.pop("latency_saved") * 1000, 1)
+        return stats
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,148 @@
+import math
+import os
+import re
+from collections import Counter
+
+TOKEN_BUDGET = int(os.getenv("HOTEL_CONTEXT_TOKEN_BUDGET", "150"))
+TOP_K = int(os.getenv("HOTEL_CONTEXT_TOP_K", "4"))
+
+# Guest wording mapped onto the words the hotel info uses
+SYNONYMS = {
+    "wifi": ["internet"], "internet": ["wifi"], "wi": ["wifi", "internet"],
+    "phone": ["contact"], "call": ["contact"], "number": ["contact"], "whatsapp": ["contact"],
+    "mail": ["email"], "address": ["location"], "where": ["location"], "located": ["location"],
+    "food": ["dining", "kitchen"], "eat": ["dining", "kitchen"], "restaurant": ["dining", "kitchen"],
+    "breakfast": ["dining"], "lunch": ["dining"], "dinner": ["dining"],
+    "ac": ["air", "conditioning"], "tv": ["television"], "bike": ["cycling"], "bicycle": ["cycling"],
+    "ev": ["electric", "charging"], "car": ["charging"], "wheelchair": ["accessible"],
+    "disabled": ["accessible"], "camera": ["cctv"], "safe": ["security"], "bath": ["bathroom"],
+    "bed": ["cot", "mattress"], "mattress": ["cot"],
+    "beach": ["sea"], "ocean": ["sea"], "big": ["area"], "size": ["area"],
+}
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "do", "does", "you", "your", "have", "has", "there", "any",
+    "of", "for", "in", "on", "to", "and", "with", "what", "how", "can", "i", "we", "it", "our",
+    "me", "please", "hotel", "by", "like",
+}
+# Heading words that don't name what a section is about ("Our facilities include")
+HEADING_FILLER = {"our", "include", "includes", "modern", "additional"}
+
+
+def stem(word):
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    return word[:-1] if word.endswith("e") and len(word) > 3 else word
+
+
+def tokenize(text, expand=False):
+    words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS]
+    if expand:
+        words += [synonym for w in words for synonym in SYNONYMS.get(w, ())]
+    return [stem(w) for w in words]
+
+
+# Rough token estimate (about four characters per token)
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+# Split the hotel knowledge into self-contained chunks: one per intro sentence, one per
+# bullet and one per "Key: value" line. Bulleted blocks also become sections, returned
+# whole when a question names them ("What amenities do you offer?").
+# Returns (chunks, sections): chunks are (text, section index or None), sections are
+# (heading, chunk indices).
+def chunk_text(text):
+    chunks, sections = [], []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        bullets = [line[1:].strip() for line in lines if line.startswith("-")]
+        if bullets:
+            heading = next((line for line in lines if not line.startswith("-")), "").rstrip(":")
+            sections.append((heading, list(range(len(chunks), len(chunks) + len(bullets)))))
+            chunks.extend((bullet, len(sections) - 1) for bullet in bullets)
+        elif all(re.match(r"^[A-Z][\w ]*:", line) for line in lines):
+            chunks.extend((line, None) for line in lines)
+        else:
+            chunks.extend((s.strip(), None) for s in re.split(r"(?<=[.!?])\s+", " ".join(lines)) if s.strip())
+    return chunks, sections
+
+
+# BM25 index over the chunks of a document. Headings are not scored, so a heading word
+# ("include") can't pull in unrelated bullets; naming a section returns all of it.
+class BM25Retriever:
+    def __init__(self, text, k1=1.2, b=0.75, token_budget=TOKEN_BUDGET, top_k=TOP_K):
+        self.text = text
+        chunks, self.sections = chunk_text(text)
+        self.chunks = [chunk for chunk, _ in chunks]
+        self._chunk_sections = [section for _, section in chunks]
+        self._section_terms = [set(tokenize(" ".join(w for w in heading.lower().split() if w not in HEADING_FILLER)))
+                               for heading, _ in self.sections]
+        self.k1 = k1
+        self.b = b
+        self.token_budget = token_budget
+        self.top_k = top_k
+        self._terms = [Counter(tokenize(chunk)) for chunk in self.chunks]
+        self._lengths = [sum(terms.values()) for terms in self._terms]
+        self._avg_length = sum(self._lengths) / len(self._lengths)
+        document_frequency = Counter(term for terms in self._terms for term in terms)
+        n = len(self.chunks)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+                     for term, df in document_frequency.items()}
+
+    def scores(self, query):
+        query_terms = set(tokenize(query, expand=True))
+        scores = []
+        for terms, length in zip(self._terms, self._lengths):
+            score = 0.0
+            for term in query_terms:
+                tf = terms.get(term)
+                if tf:
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / self._avg_length)
+                    score += self._idf[term] * tf * (self.k1 + 1) / norm
+            scores.append(score)
+        return scores
+
+    # Sections whose heading names something the query asks about
+    def matching_sections(self, query):
+        query_terms = set(tokenize(query, expand=True))
+        return [i for i, terms in enumerate(self._section_terms) if terms & query_terms]
+
+    # Every section the query names, then the best matching chunks within the token
+    # budget, in document order. Falls back to the whole text when nothing matches, so
+    # vague questions still get full context.
+    def context(self, query):
+        sections = self.matching_sections(query)
+        scores = self.scores(query)
+        ranked = sorted((i for i, score in enumerate(scores) if score > 0 and self._chunk_sections[i] not in sections),
+                        key=lambda i: -scores[i])
+        if not ranked and not sections:
+            return self.text
+        budget = self.token_budget - sum(estimate_tokens(self._render_section(i)) for i in sections)
+        selected = []
+        for i in ranked[:self.top_k]:
+            tokens = estimate_tokens(self._render_chunk(i))
+            if tokens > budget:
+                break
+            selected.append(i)
+            budget -= tokens
+        if not selected and not sections:
+            selected = ranked[:1]
+        parts = [(self.sections[i][1][0], self._render_section(i)) for i in sections]
+        parts += [(i, self._render_chunk(i)) for i in selected]
+        return "\n".join(text for _, text in sorted(parts))
+
+    # A bullet keeps its heading so the model knows what the list is about
+    def _render_chunk(self, i):
+        section = self._chunk_sections[i]
+        if section is None or not self.sections[section][0]:
+            return self.chunks[i]
+        return f"{self.sections[section][0]}: {self.chunks[i]}"
+
+    def _render_section(self, i):
+        heading, members = self.sections[i]
+        bullets = "\n".join(f"- {self.chunks[j]}" for j in members)
+        return f"{heading}:\n{bullets}" if heading else bullets
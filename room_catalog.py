@@ -0,0 +1,143 @@
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# Change-log entries kept; a chat server further behind than this reloads every room
+CHANGE_LOG_SIZE = int(os.getenv("ROOM_CHANGE_LOG_SIZE", "10000"))
+BUSY_TIMEOUT = 5.0
+
+ROOM_DATA_SQL = """
+CREATE TABLE room_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT ''
+)
+"""
+# Every write to room_data, from the editor or anything else, bumps the change version
+CHANGE_LOG_SQL = [
+    """CREATE TABLE IF NOT EXISTS room_changes (
+        version INTEGER PRIMARY KEY AUTOINCREMENT,
+        room_id INTEGER NOT NULL,
+        changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS room_data_inserted AFTER INSERT ON room_data
+    BEGIN INSERT INTO room_changes (room_id) VALUES (NEW.id); END""",
+    """CREATE TRIGGER IF NOT EXISTS room_data_updated AFTER UPDATE ON room_data
+    BEGIN INSERT INTO room_changes (room_id) VALUES (NEW.id); END""",
+    """CREATE TRIGGER IF NOT EXISTS room_data_deleted AFTER DELETE ON room_data
+    BEGIN INSERT INTO room_changes (room_id) VALUES (OLD.id); END""",
+]
+CHANGE_LOG_OBJECTS = ("room_changes", "room_data_inserted", "room_data_updated", "room_data_deleted")
+# Rows that did not change are skipped, so they keep their version
+UPSERT_SQL = """
+INSERT INTO room_data (id, title, description) VALUES (?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET title = excluded.title, description = excluded.description
+WHERE title IS NOT excluded.title OR description IS NOT excluded.description
+"""
+INSERT_SQL = "INSERT INTO room_data (title, description) VALUES (?, ?)"
+DELETE_SQL = "DELETE FROM room_data WHERE id = ?"
+# rowid is the id once migrated, and still works on a table that has not been
+ROOMS_SQL = "SELECT rowid, title, description FROM room_data ORDER BY rowid"
+CHANGE_VERSION_SQL = "SELECT COALESCE(MAX(version), 0), MIN(version) FROM room_changes"
+
+
+def _columns(conn):
+    return [row[1] for row in conn.execute("PRAGMA table_info(room_data)")]
+
+def _migrated(conn):
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    return "id" in _columns(conn) and names.issuperset(CHANGE_LOG_OBJECTS)
+
+
+# Gives room_data a stable integer primary key (existing rows keep their rowid as id),
+# adds the change log and switches the database to WAL so saves never block readers.
+# The editor and every chat server run this on startup, so the migration and the
+# triggers are decided and created under one write lock.
+def ensure_schema(path):
+    try:
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if _migrated(conn):
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                columns = _columns(conn)
+                if "id" not in columns:
+                    if columns:
+                        conn.execute("ALTER TABLE room_data RENAME TO room_data_old")
+                    conn.execute(ROOM_DATA_SQL)
+                    if columns:
+                        conn.execute("INSERT INTO room_data (id, title, description) "
+                                     "SELECT rowid, COALESCE(title, ''), COALESCE(description, '') FROM room_data_old")
+                        conn.execute("DROP TABLE room_data_old")
+                    logger.info(f"Added a primary key to room_data in {path}")
+                for statement in CHANGE_LOG_SQL:
+                    conn.execute(statement)
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not migrate room_data in {path}: {e}")
+
+
+# Latest change version, or None when the database has no change log yet
+def change_version(conn):
+    try:
+        return conn.execute(CHANGE_VERSION_SQL).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+
+
+# Ids of the rooms changed after `version`, or None when the log no longer reaches back
+# that far and everything has to be reloaded
+def changes_since(conn, version):
+    latest, oldest = conn.execute(CHANGE_VERSION_SQL).fetchone()
+    if latest > version and (oldest is None or oldest > version + 1):
+        return None
+    return {row[0] for row in conn.execute("SELECT room_id FROM room_changes WHERE version > ?", (version,))}
+
+
+# (id, title, description) of every room, or of the given ids that still exist
+def load_rooms(conn, ids=None):
+    if ids is None:
+        return conn.execute(ROOMS_SQL).fetchall()
+    ids = list(ids)
+    rows = []
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        rows += conn.execute(f"SELECT rowid, title, description FROM room_data WHERE rowid IN ({','.join('?' * len(chunk))})",
+                             chunk).fetchall()
+    return rows
+
+
+# Writes the edited rooms in one short transaction. `rooms` holds (id, title,
+# description) with id None for new rooms; `deleted` holds ids to remove. Returns the
+# change version after the save.
+def save_rooms(path, rooms=(), deleted=()):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for room_id, title, description in rooms:
+                if room_id is None:
+                    conn.execute(INSERT_SQL, (title, description))
+                else:
+                    conn.execute(UPSERT_SQL, (room_id, title, description))
+            conn.executemany(DELETE_SQL, [(room_id,) for room_id in deleted])
+            version = conn.execute(CHANGE_VERSION_SQL).fetchone()[0]
+            conn.execute("DELETE FROM room_changes WHERE version <= ?", (version - CHANGE_LOG_SIZE,))
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return version
+    finally:
+        conn.close()
@@ -0,0 +1,61 @@
+import re
+import sqlite3
+import threading
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "do", "does", "you", "your", "have", "has", "there", "any",
+    "of", "for", "in", "on", "to", "and", "with", "what", "how", "can", "i", "we", "it", "me",
+    "please", "room", "rooms", "want", "need", "book", "like", "would", "available",
+}
+
+
+# FTS5 MATCH expression that ORs the guest's words as prefix terms
+def match_expression(query):
+    words = [w for w in re.findall(r"[a-z0-9]+", query.lower()) if len(w) > 1 and w not in STOPWORDS]
+    return " OR ".join(f'"{w}"*' for w in dict.fromkeys(words))
+
+
+# In-memory SQLite FTS5 index over room titles and descriptions, keyed by room id. A full
+# rebuild is swapped in atomically, so searches never wait on it; edits to a few rooms
+# are applied in place.
+class RoomIndex:
+    def __init__(self):
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # `rows` holds (id, title, description)
+    def rebuild(self, rows):
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute("CREATE VIRTUAL TABLE room_fts USING fts5(title, description, tokenize='porter unicode61')")
+        conn.executemany("INSERT INTO room_fts (rowid, title, description) VALUES (?, ?, ?)",
+                         [(room_id, title or "", desc or "") for room_id, title, desc in rows])
+        conn.commit()
+        with self._lock:
+            old, self._conn = self._conn, conn
+        if old is not None:
+            old.close()
+
+    # Replace the changed (id, title, description) rows and drop the deleted ids
+    def apply(self, changed, deleted=()):
+        with self._lock:
+            if self._conn is None:
+                return
+            with self._conn:
+                self._conn.executemany("DELETE FROM room_fts WHERE rowid = ?",
+                                       [(room_id,) for room_id in deleted] + [(row[0],) for row in changed])
+                self._conn.executemany("INSERT INTO room_fts (rowid, title, description) VALUES (?, ?, ?)",
+                                       [(room_id, title or "", desc or "") for room_id, title, desc in changed])
+
+    # Best matching (title, description) rows, most relevant first
+    def search(self, query, limit=5):
+        expression = match_expression(query)
+        if not expression:
+            return []
+        with self._lock:
+            if self._conn is None:
+                return []
+            return self._conn.execute(
+                "SELECT title, description FROM room_fts WHERE room_fts MATCH ? "
+                "ORDER BY bm25(room_fts, 2.0, 1.0) LIMIT ?",
+                (expression, limit)
+            ).fetchall()
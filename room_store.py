@@ -0,0 +1,148 @@
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+import room_catalog
+from room_index import RoomIndex
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = float(os.getenv("ROOM_REFRESH_INTERVAL", "1.0"))
+# Catalogs up to this size go to the LLM whole; larger ones only send the matching rooms
+MAX_CONTEXT_ROOMS = int(os.getenv("ROOM_CONTEXT_MAX_ROOMS", "5"))
+NO_ROOMS = "No room details available."
+
+
+def format_rooms(rows):
+    if rows:
+        return "\n\n".join([f"Room: {title}\nDescription: {desc}" for title, desc in rows])
+    return NO_ROOMS
+
+
+# Keeps the formatted room context in memory and rebuilds it only when rooms.db changes.
+# A background thread polls PRAGMA data_version on its own connection (the value moves
+# whenever another connection commits), so request threads never touch the database.
+# After a commit, the room_changes log says which rooms changed: only those are re-read
+# and re-indexed, and commits that touched no room (bookings) leave `version` alone.
+# `listeners` are called with a pooled connection after every commit, so other in-memory
+# views of rooms.db (room availability) follow the same change detection.
+class RoomContextStore:
+    def __init__(self, pool, interval=REFRESH_INTERVAL, listeners=()):
+        self.pool = pool
+        self.interval = interval
+        self.listeners = list(listeners)
+        self.version = 0
+        self.index = RoomIndex()
+        self._rooms = {}
+        self._rows = []
+        self._context = None
+        self._conn = None
+        self._data_version = None
+        self._schema_version = None
+        self._change_version = None
+        self._schema_checked = False
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stopped = threading.Event()
+        self._stats = {"full_reloads": 0, "incremental_reloads": 0, "rooms_reloaded": 0}
+
+    def _connect(self):
+        uri = f"{Path(self.pool.path).resolve().as_uri()}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    # Rows to reload: None for all of them, otherwise the ids changed since the last load
+    def _changed_rooms(self, conn, schema_version, change_version):
+        if (self._context is None or change_version is None or self._change_version is None
+                or schema_version != self._schema_version):
+            return None
+        return room_catalog.changes_since(conn, self._change_version)
+
+    # Rebuild the context if the room data changed since the last look; returns True on rebuild
+    def refresh(self, force=False):
+        with self._lock:
+            if not self._schema_checked:
+                room_catalog.ensure_schema(self.pool.path)
+                self._schema_checked = True
+            try:
+                if self._conn is None:
+                    self._conn = self._connect()
+                data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if not force and self._context is not None and data_version == self._data_version:
+                    return False
+                with self.pool.connection() as conn:
+                    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+                    change_version = room_catalog.change_version(conn)
+                    changed = None if force else self._changed_rooms(conn, schema_version, change_version)
+                    rows = room_catalog.load_rooms(conn, changed) if changed is None or changed else []
+                    for listener in self.listeners:
+                        listener(conn)
+                    # Listeners may create their tables on first use
+                    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            except (sqlite3.Error, TimeoutError) as e:
+                logger.error(f"Could not load room details: {e}")
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                if self._context is None:
+                    self._context = NO_ROOMS
+                return False
+            self._data_version = data_version
+            self._schema_version = schema_version
+            self._change_version = change_version
+            if changed is None:
+                self._rooms = {room_id: (title, desc) for room_id, title, desc in rows}
+                self.index.rebuild(rows)
+                self._stats["full_reloads"] += 1
+            elif changed:
+                # Ids only grow, so new rooms land at the end and the dict stays in id order
+                for room_id in changed - {row[0] for row in rows}:
+                    self._rooms.pop(room_id, None)
+                for room_id, title, desc in rows:
+                    self._rooms[room_id] = (title, desc)
+                self.index.apply(rows, changed)
+                self._stats["incremental_reloads"] += 1
+            else:
+                return False
+            self._stats["rooms_reloaded"] += len(rows)
+            self._rows = list(self._rooms.values())
+            self._context = format_rooms(self._rows)
+            self.version += 1
+        logger.info(f"Room context rebuilt ({len(rows)} of {len(self._rows)} rooms reloaded, version {self.version})")
+        return True
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            self.refresh()
+
+    def start(self):
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, name="room-store-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def get(self):
+        if self._context is None:
+            self.refresh()
+            self.start()
+        return self._context
+
+    # Room context for a guest query: the whole catalog when it is small, otherwise only
+    # the rooms whose title or description match the guest's wording
+    def context(self, query):
+        full = self.get()
+        if len(self._rows) <= MAX_CONTEXT_ROOMS:
+            return full
+        matches = self.index.search(query, MAX_CONTEXT_ROOMS)
+        if not matches:
+            matches = self._rows[:MAX_CONTEXT_ROOMS]
+        return format_rooms(matches)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "rooms": len(self._rows), "version": self.version,
+                    "change_version": self._change_version}
@@ -0,0 +1,45 @@
+from datetime import date
+
+import pytest
+
+from availability import RoomCalendar, parse_stay
+
+TODAY = date(2026, 10, 16)
+
+
+@pytest.mark.parametrize("query, stay", [
+    ("Any rooms from 2026-11-14 to 2026-11-16?", (date(2026, 11, 14), date(2026, 11, 16))),
+    ("Is a room free March 14-16?", (date(2027, 3, 14), date(2027, 3, 16))),
+    ("14th to 16th of December", (date(2026, 12, 14), date(2026, 12, 16))),
+    ("Need a room on 20 Nov for 3 nights", (date(2026, 11, 20), date(2026, 11, 23))),
+    ("Rooms free from 14/11 to 16/11?", (date(2026, 11, 14), date(2026, 11, 16))),
+    ("14/11-16/11 any rooms?", (date(2026, 11, 14), date(2026, 11, 16))),
+    ("I want to stay 3/12", (date(2026, 12, 3), date(2026, 12, 4))),
+    ("Any rooms on 24/7/2027?", (date(2027, 7, 24), date(2027, 7, 25))),
+    ("Book a room with 24/7 room service on 14/11", (date(2026, 11, 14), date(2026, 11, 15))),
+    ("A room for tomorrow for a week", (date(2026, 10, 17), date(2026, 10, 24))),
+    ("Can I check in on the 20th?", (date(2026, 10, 20), date(2026, 10, 21))),
+])
+def test_parse_stay(query, stay):
+    assert parse_stay(query, TODAY) == stay
+
+
+@pytest.mark.parametrize("query", [
+    "Is hot water available 24/7?",
+    "Do you have 24/7 power backup?",
+    "Is the front desk open 24/7 for guests?",
+    "Is the pool open 9/5?",
+    "Do you have a room on the 2nd floor?",
+    "What is the price of a deluxe room?",
+])
+def test_parse_stay_without_dates(query):
+    assert parse_stay(query, TODAY) is None
+
+
+def test_room_calendar_merges_and_finds_next_free():
+    calendar = RoomCalendar([(10, 12), (12, 14), (20, 22)])
+    assert calendar.starts == [10, 20] and calendar.ends == [14, 22]
+    assert calendar.is_free(14, 20)
+    assert not calendar.is_free(13, 15)
+    assert calendar.next_free(11, 3) == 14
+    assert calendar.next_free(15, 6) == 22
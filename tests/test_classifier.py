@@ -0,0 +1,54 @@
+from benchmarks.eval_classifier import HELDOUT_CASES, evaluate
+from classifier import TRAINING_SAMPLES, FastClassifier, HashedNaiveBayes
+
+
+def test_rules_decide_one_sided_queries():
+    classifier = FastClassifier(threshold=0.9)
+    assert classifier.predict("Can I book a room for 2 nights?") == ("1", 1.0, "rules")
+    assert classifier.predict("Do you have wifi?") == ("2", 1.0, "rules")
+    assert classifier.predict("Are pets allowed in the room?") == ("2", 1.0, "rules")
+
+
+def test_rules_defer_to_model_when_both_or_neither_match():
+    classifier = FastClassifier(threshold=0.9)
+    assert classifier.predict("Is wifi available in the room?")[2] == "model"
+    assert classifier.predict("Is the area noisy at night")[2] == "model"
+
+
+def test_model_fits_its_training_samples():
+    model = HashedNaiveBayes().fit(TRAINING_SAMPLES)
+    probabilities = model.predict_proba("I want to book a room")
+    assert abs(sum(probabilities.values()) - 1) < 1e-9
+    assert max(probabilities, key=probabilities.get) == "1"
+
+
+def test_calibration_softens_overconfident_scores():
+    raw = HashedNaiveBayes().fit(TRAINING_SAMPLES)
+    calibrated = HashedNaiveBayes().fit(TRAINING_SAMPLES).calibrate(TRAINING_SAMPLES)
+    assert calibrated.temperature > 1
+    query = "I want a room for me and my wife"
+    assert max(calibrated.predict_proba(query).values()) < max(raw.predict_proba(query).values())
+
+
+def test_uncertain_query_falls_back_to_llm():
+    classifier = FastClassifier(threshold=0.9)
+    label, confidence, path = classifier.predict("What is the cancellation policy?")
+    assert path == "model" and confidence < 0.9
+    assert classifier.classify("What is the cancellation policy?") is None
+    classifier.record_fallback()
+    assert classifier.classify("Do you have wifi?") == "2"
+    stats = classifier.stats()
+    assert (stats["llm"], stats["rules"], stats["model"]) == (1, 1, 0)
+
+
+def test_threshold_zero_never_falls_back():
+    classifier = FastClassifier(threshold=0.0)
+    assert classifier.classify("What is the cancellation policy?") == "2"
+    assert classifier.stats()["model"] == 1
+
+
+def test_heldout_accuracy_at_configured_threshold():
+    assert not {query for query, _ in HELDOUT_CASES} & {text for text, _ in TRAINING_SAMPLES}
+    result = evaluate(FastClassifier(threshold=0.9), 0.9)
+    assert result["accuracy"] >= 0.95, result["wrong"]
+    assert result["coverage"] >= 0.5
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+from classify_batcher import ClassificationBatcher, parse_batch_labels
+from groq_scheduler import PRIORITY_WEB, PRIORITY_WHATSAPP, priority_for, request_channel
+
+
+def test_batch_sent_in_most_urgent_member_lane():
+    sent = []
+
+    def send(messages, count, priority):
+        sent.append(priority)
+        return "\n".join(f"{i}: 2" for i in range(1, count + 1))
+
+    batcher = ClassificationBatcher(send, window_ms=100, max_size=2)
+    web = batcher.submit("Do you have a pool?", priority_for())
+    with request_channel("whatsapp"):
+        whatsapp = batcher.submit("Is breakfast included?", priority_for())
+    assert web.result(5) == whatsapp.result(5) == "2"
+    assert PRIORITY_WHATSAPP < PRIORITY_WEB
+    assert sent == [PRIORITY_WHATSAPP]
+
+
+def test_batch_without_priorities_uses_default_lane():
+    sent = []
+
+    def send(messages, count, priority):
+        sent.append(priority)
+        return "1: 1"
+
+    batcher = ClassificationBatcher(send, window_ms=1, max_size=1)
+    assert batcher.submit("Book a room for tomorrow").result(5) == "1"
+    assert sent == [None]
+
+
+def test_parse_batch_labels_skips_unparsed_items():
+    assert parse_batch_labels("1: 2\n3) 1\nfoo", 3) == ["2", None, "1"]
+
+
+def test_cancelled_caller_does_not_strand_the_batch():
+    sent = []
+
+    def send(messages, count, priority):
+        sent.append(count)
+        return "\n".join(f"{i}: 1" for i in range(1, count + 1))
+
+    batcher = ClassificationBatcher(send, window_ms=100, max_size=3)
+    gone = batcher.submit("Is there a room tonight?")
+    waiting = batcher.submit("Book a room for two")
+    assert gone.cancel()
+    assert waiting.result(5) == "1"
+    assert sent == [1]
+    assert batcher.stats()["cancelled"] == 1
+
+
+def test_async_caller_cancelled_while_batch_is_sent():
+    release = threading.Event()
+
+    def send(messages, count, priority):
+        release.wait(5)
+        return "\n".join(f"{i}: 2" for i in range(1, count + 1))
+
+    batcher = ClassificationBatcher(send, window_ms=20, max_size=2)
+
+    async def callers():
+        gone = asyncio.ensure_future(batcher.classify_async("Do you have a pool?"))
+        await asyncio.sleep(0.1)
+        gone.cancel()
+        waiting = batcher.submit("Is breakfast included?")
+        release.set()
+        return await asyncio.wrap_future(waiting)
+
+    assert asyncio.run(callers()) == "2"
+
+
+def test_classify_gives_up_after_timeout():
+    release = threading.Event()
+
+    def send(messages, count, priority):
+        release.wait(5)
+        return "1: 1"
+
+    batcher = ClassificationBatcher(send, window_ms=1, max_size=1)
+    assert batcher.classify("Any rooms free?", timeout=0.1) is None
+    assert batcher.stats()["timed_out"] == 1
+    release.set()
@@ -0,0 +1,37 @@
+import sqlite3
+
+import pytest
+
+from db_pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    path = tmp_path / "rooms.db"
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE room_data (title TEXT, description TEXT)")
+        conn.execute("INSERT INTO room_data VALUES ('Deluxe', 'Sea view')")
+    conn.close()
+    pool = ConnectionPool(str(path), size=2)
+    yield pool
+    pool.close()
+
+
+def test_connection_returned_after_unexpected_error(pool):
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            with pool.connection():
+                raise KeyError("listener failed")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT title FROM room_data").fetchone() == ("Deluxe",)
+    assert pool.stats()["open"] <= 2
+
+
+def test_connection_discarded_after_sqlite_error(pool):
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as conn:
+            conn.execute("SELECT * FROM missing_table")
+    assert pool.stats()["open"] == 0
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM room_data").fetchone() == (1,)
@@ -0,0 +1,44 @@
+import importlib
+
+import pytest
+
+from benchmarks.mock_groq import MockGroqServer
+from groq_scheduler import RateLimitScheduler
+
+
+@pytest.fixture
+def chatbot(tmp_path, monkeypatch):
+    server = MockGroqServer(ttft_ms=1, per_token_ms=0, reply_tokens=5, error_rate=0.4, retry_after=0.01,
+                            request_reset="10ms", token_reset="10ms", seed=7).start()
+    monkeypatch.setenv("GROQ_BASE_URL", server.base_url)
+    monkeypatch.setenv("GROQ_API_KEY", "mock-key")
+    monkeypatch.setenv("GROQ_PREWARM_CONNECTIONS", "0")
+    # chatbot opens rooms.db in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("chatbot")
+    module._clients.clear()
+    scheduler = RateLimitScheduler(initial=8, queue_timeout=10)
+    monkeypatch.setattr(module, "groq_scheduler", scheduler)
+    yield module, server, scheduler
+    module._clients.clear()
+    server.stop()
+
+
+def test_every_429_reaches_the_scheduler(chatbot):
+    from groq import RateLimitError
+    module, server, scheduler = chatbot
+    answered = exhausted = 0
+    for i in range(30):
+        try:
+            module.complete("generate", "mock-model", [{"role": "user", "content": f"Question {i}"}], 20)
+            answered += 1
+        except RateLimitError:
+            exhausted += 1
+
+    stats = scheduler.stats()
+    assert server.errors > 0
+    assert stats["rate_limited"] == server.errors
+    assert stats["retried"] == server.errors - exhausted
+    assert server.requests == answered
+    assert stats["in_flight"] == 0
+    assert stats["concurrency_limit"] < 8
@@ -0,0 +1,38 @@
+import pytest
+
+from groq_scheduler import PRIORITY_WEB, RateLimitScheduler, SchedulerOverloaded
+
+
+def stream(scheduler):
+    with scheduler.slot(PRIORITY_WEB):
+        yield "token"
+        yield "token"
+
+
+def test_slot_released_when_stream_is_closed():
+    scheduler = RateLimitScheduler(initial=2, queue_timeout=0.1)
+    for _ in range(3):
+        tokens = stream(scheduler)
+        next(tokens)
+        tokens.close()
+    assert scheduler.in_flight == 0
+    assert scheduler.limit == 2
+    with scheduler.slot(PRIORITY_WEB):
+        assert scheduler.in_flight == 1
+
+
+def test_slot_released_on_error():
+    scheduler = RateLimitScheduler(initial=1, queue_timeout=0.1)
+    with pytest.raises(KeyError):
+        with scheduler.slot(PRIORITY_WEB):
+            raise KeyError("boom")
+    assert scheduler.in_flight == 0
+
+
+def test_queue_deadline_sheds_waiter():
+    scheduler = RateLimitScheduler(initial=1, queue_timeout=0.05)
+    with scheduler.slot(PRIORITY_WEB):
+        with pytest.raises(SchedulerOverloaded):
+            with scheduler.slot(PRIORITY_WEB):
+                pass
+    assert scheduler.stats()["shed"] == 1
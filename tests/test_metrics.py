@@ -0,0 +1,22 @@
+import metrics
+
+
+def query_counts():
+    return {key[0]: value for key, value in metrics.QUERIES.series()}
+
+
+def test_query_type_label_is_bounded():
+    before = query_counts()
+    for query_type in ("1", "2", "cached", "single_shot", None, "", " 3", "Sure! This is a booking question."):
+        metrics.record_query(query_type)
+    after = query_counts()
+    assert set(after) <= {"booking", "info", "cached", "single_shot", "unclassified"}
+    assert after["unclassified"] - before.get("unclassified", 0) == 4
+    assert after["booking"] - before.get("booking", 0) == 1
+
+
+def test_render_lists_only_known_query_types():
+    metrics.record_query("Let me check the rooms for you")
+    rendered = metrics.registry.render()
+    assert "Let me check" not in rendered
+    assert 'chatbot_queries_total{query_type="unclassified"}' in rendered
@@ -0,0 +1,37 @@
+import pytest
+
+from response_cache import ResponseCache, cosine, embed, normalize
+
+VERSION = (1, 1)
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("Is breakfast included?", "Is breakfast not included?"),
+    ("Is breakfast included?", "Isn't breakfast included?"),
+    ("Do you have parking?", "Do you have no parking?"),
+    ("Can I check in early?", "Can't I check in early?"),
+    ("Room with a balcony", "Room without a balcony"),
+])
+def test_negation_never_matches_similar_entry(cached, asked):
+    cache = ResponseCache(threshold=0.5)
+    cache.put(cached, VERSION, "cached answer")
+    assert cache.get(asked, VERSION) is None
+
+
+def test_negated_pairs_score_above_threshold():
+    # Without the negation guard these would be served each other's answers
+    breakfast = cosine(embed(normalize("Is breakfast included?")), embed(normalize("Is breakfast not included?")))
+    assert breakfast >= 0.85
+
+
+def test_negated_queries_match_each_other():
+    cache = ResponseCache()
+    cache.put("Isn't breakfast included?", VERSION, "breakfast answer")
+    assert cache.get("Is breakfast not included", VERSION) == "breakfast answer"
+
+
+def test_numbers_must_match():
+    cache = ResponseCache(threshold=0.5)
+    cache.put("Room for 2 guests", VERSION, "two")
+    assert cache.get("Room for 3 guests", VERSION) is None
+    assert cache.get("room for 2 guests please", VERSION) == "two"
@@ -0,0 +1,41 @@
+from retrieval import BM25Retriever, stem
+
+INFO = """Sea View Inn sits on a quiet beach.
+
+Our facilities include:
+- Air conditioning
+- Wardrobe and mirror
+- Flat-screen television
+
+Modern amenities:
+- Hot water
+- WiFi internet
+- Power backup
+
+Additional services:
+- Yoga classes
+- On-site dining at the Kitchen
+
+Contact: +91-00000 00000"""
+
+
+def test_named_section_is_returned_whole():
+    context = BM25Retriever(INFO, top_k=1, token_budget=10).context("What amenities do you offer?")
+    assert context.startswith("Modern amenities:")
+    for bullet in ("Hot water", "WiFi internet", "Power backup"):
+        assert f"- {bullet}" in context
+
+
+def test_heading_words_are_not_scored():
+    context = BM25Retriever(INFO).context("Is breakfast included in the price?")
+    assert "dining" in context
+    assert "Wardrobe" not in context and "television" not in context
+
+
+def test_single_bullet_keeps_its_heading():
+    assert BM25Retriever(INFO).context("Is there wifi?") == "Modern amenities: WiFi internet"
+
+
+def test_plural_and_singular_share_a_stem():
+    assert stem("amenities") == stem("amenity")
+    assert stem("facilities") == stem("facility")
@@ -0,0 +1,55 @@
+import logging
+import sqlite3
+import threading
+import time
+
+from room_catalog import change_version, changes_since, ensure_schema, load_rooms, save_rooms
+
+
+def legacy_db(path, rooms=3):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE room_data (title TEXT, description TEXT)")
+        conn.executemany("INSERT INTO room_data VALUES (?, ?)", [(f"Room {i}", f"View {i}") for i in range(rooms)])
+    conn.close()
+
+
+def test_migration_keeps_rows_and_logs_changes(tmp_path):
+    path = str(tmp_path / "rooms.db")
+    legacy_db(path)
+    ensure_schema(path)
+    ensure_schema(path)
+    conn = sqlite3.connect(path)
+    assert load_rooms(conn) == [(1, "Room 0", "View 0"), (2, "Room 1", "View 1"), (3, "Room 2", "View 2")]
+    assert change_version(conn) == 0
+    version = save_rooms(path, [(2, "Suite", "View 1"), (None, "Room 3", "View 3")], deleted=[1])
+    assert changes_since(conn, 0) == {1, 2, 4}
+    assert change_version(conn) == version == 3
+    conn.close()
+
+
+def test_concurrent_migrations_run_once(tmp_path, caplog):
+    path = str(tmp_path / "rooms.db")
+    legacy_db(path, rooms=200)
+    # Every process decides to migrate, then waits for the write lock held here
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("PRAGMA journal_mode=WAL")
+    holder.execute("BEGIN IMMEDIATE")
+    threads = [threading.Thread(target=ensure_schema, args=(path,)) for _ in range(4)]
+    with caplog.at_level(logging.INFO, logger="room_catalog"):
+        for thread in threads:
+            thread.start()
+        time.sleep(0.3)
+        holder.execute("COMMIT")
+        for thread in threads:
+            thread.join()
+    holder.close()
+
+    assert sum("Added a primary key" in message for message in caplog.messages) == 1
+    conn = sqlite3.connect(path)
+    assert [row[0] for row in load_rooms(conn)] == list(range(1, 201))
+    conn.close()
+    save_rooms(path, [(None, "New room", "Garden view")])
+    conn = sqlite3.connect(path)
+    assert changes_since(conn, 0) == {201}
+    conn.close()
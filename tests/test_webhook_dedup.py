@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+from webhook_dedup import WebhookDeduplicator
+
+
+def test_run_async_answers_concurrent_retries_once(tmp_path):
+    dedup = WebhookDeduplicator(db_path=str(tmp_path / "dedup.db"))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "<Response/>"
+
+    async def deliveries():
+        return await asyncio.gather(*(dedup.run_async("SM1", compute) for _ in range(5)))
+
+    assert asyncio.run(deliveries()) == ["<Response/>"] * 5
+    assert len(calls) == 1
+    assert dedup.stats()["waited"] == 4
+    assert asyncio.run(dedup.run_async("SM1", compute)) == "<Response/>"
+    assert len(calls) == 1
+
+
+def test_run_async_retry_waits_for_threaded_delivery(tmp_path):
+    dedup = WebhookDeduplicator(db_path=str(tmp_path / "dedup.db"))
+    started, release = threading.Event(), threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    leader = threading.Thread(target=dedup.run, args=("SM2", compute))
+    leader.start()
+    started.wait(5)
+
+    async def retry():
+        task = asyncio.ensure_future(dedup.run_async("SM2", compute_again))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await task
+
+    async def compute_again():
+        return "second"
+
+    assert asyncio.run(retry()) == "first"
+    leader.join()
+
+
+def test_second_delivery_served_from_database(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    WebhookDeduplicator(db_path=path).run("SM3", lambda: "stored")
+
+    async def compute():
+        return "recomputed"
+
+    assert asyncio.run(WebhookDeduplicator(db_path=path).run_async("SM3", compute)) == "stored"
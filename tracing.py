@@ -0,0 +1,120 @@
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests whose spans are appended to TRACE_FILE; Server-Timing is always sent
+SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_HEADER = "X-Trace-Id"
+VALID_TRACE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+current_trace = contextvars.ContextVar("current_trace", default=None)
+_file_lock = threading.Lock()
+
+
+# Spans of one request; `start` is wall-clock for the trace file, `origin` the
+# perf_counter reading taken at the same moment
+class Trace:
+    __slots__ = ("trace_id", "name", "sampled", "start", "origin", "spans")
+
+    def __init__(self, trace_id, name, sampled):
+        self.trace_id = trace_id
+        self.name = name
+        self.sampled = sampled
+        self.start = time.time()
+        self.origin = time.perf_counter()
+        self.spans = []
+
+    def record(self, name, started, duration):
+        self.spans.append((name, started, duration, threading.get_ident()))
+
+    def elapsed(self):
+        return time.perf_counter() - self.origin
+
+    # `classify;dur=3.1, generate;dur=412.0, total;dur=420.5` with repeated stages summed
+    def server_timing(self):
+        totals = {}
+        for name, _, duration, _ in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        entries = [f"{name};dur={duration * 1000:.1f}" for name, duration in totals.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+    # Chrome trace "complete" events, one row per trace in the viewer
+    def events(self):
+        pid, tid = os.getpid(), zlib.crc32(self.trace_id.encode()) % 2 ** 31
+        base = self.start * 1e6
+        args = {"trace_id": self.trace_id}
+        yield {"name": self.name, "cat": "request", "ph": "X", "ts": round(base, 1),
+               "dur": round(self.elapsed() * 1e6, 1), "pid": pid, "tid": tid, "args": args}
+        for name, started, duration, thread in self.spans:
+            yield {"name": name, "cat": "stage", "ph": "X", "ts": round(base + (started - self.origin) * 1e6, 1),
+                   "dur": round(duration * 1e6, 1), "pid": pid, "tid": tid, "args": {**args, "thread": thread}}
+
+    def finish(self):
+        if not self.sampled or not TRACE_FILE:
+            return
+        lines = "".join(json.dumps(event) + "\n" for event in self.events())
+        try:
+            with _file_lock, open(TRACE_FILE, "a") as f:
+                f.write(lines)
+        except OSError:
+            logger.exception(f"Could not write trace {self.trace_id} to {TRACE_FILE}")
+
+
+# Start a trace for the current request, reusing the caller's trace ID when it is sane
+def begin(name, trace_id=None, sample_rate=SAMPLE_RATE):
+    if not trace_id or not VALID_TRACE_ID.match(trace_id):
+        trace_id = uuid.uuid4().hex
+    trace = Trace(trace_id, name, random.random() < sample_rate)
+    current_trace.set(trace)
+    return trace
+
+
+# Called by metrics.stage for every timed stage; a no-op outside a traced request
+def record(name, started, duration):
+    trace = current_trace.get()
+    if trace is not None:
+        trace.record(name, started, duration)
+
+
+# Add the trace headers to a Flask or Quart response. The trace file entry is written
+# once the body has been sent when the framework supports it (streamed responses),
+# otherwise right away.
+def attach(response):
+    trace = current_trace.get()
+    if trace is None:
+        return response
+    response.headers["Server-Timing"] = trace.server_timing()
+    response.headers[TRACE_HEADER] = trace.trace_id
+    call_on_close = getattr(response, "call_on_close", None)
+    if call_on_close is not None:
+        call_on_close(trace.finish)
+    else:
+        trace.finish()
+    return response
+
+
+# `python tracing.py traces.jsonl > trace.json` produces a file that chrome://tracing
+# or https://ui.perfetto.dev can open
+def main():
+    if len(sys.argv) != 2:
+        print("usage: python tracing.py TRACE_FILE > trace.json", file=sys.stderr)
+        sys.exit(2)
+    with open(sys.argv[1]) as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import importlib.util
+import logging
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com")
+POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "120"))
+HTTP2 = os.getenv("GROQ_HTTP2", "1") == "1"
+CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "30"))
+PREWARM_CONNECTIONS = int(os.getenv("GROQ_PREWARM_CONNECTIONS", "2"))
+KEEPALIVE_INTERVAL = float(os.getenv("GROQ_KEEPALIVE_INTERVAL", "60"))
+LOG_TIMINGS = os.getenv("GROQ_LOG_TIMINGS", "1") == "1"
+
+# Cheap authenticated endpoint used to open and keep connections alive
+PING_PATH = "/openai/v1/models"
+
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+def http2_enabled():
+    if HTTP2 and importlib.util.find_spec("h2") is None:
+        logger.warning("GROQ_HTTP2 is on but the h2 package is not installed, using HTTP/1.1")
+        return False
+    return HTTP2
+
+
+# Collects httpcore trace events for one request. Connect time includes DNS resolution,
+# which httpcore does inside connect_tcp; reused connections report no connect/TLS time ("-").
+class CallTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = {}
+
+    def __call__(self, event_name, info):
+        self.marks[event_name] = time.perf_counter()
+
+    def _between(self, started, completed):
+        if started in self.marks and completed in self.marks:
+            return (self.marks[completed] - self.marks[started]) * 1000
+        return None
+
+    def breakdown(self):
+        ttfb = next((self.marks[name] for name in ("http11.receive_response_headers.complete",
+                                                   "http2.receive_response_headers.complete")
+                     if name in self.marks), None)
+        return {
+            "connect_ms": self._between("connection.connect_tcp.started", "connection.connect_tcp.complete"),
+            "tls_ms": self._between("connection.start_tls.started", "connection.start_tls.complete"),
+            "ttfb_ms": (ttfb - self.start) * 1000 if ttfb else None,
+        }
+
+
+class AsyncCallTimer(CallTimer):
+    async def __call__(self, event_name, info):
+        self.marks[event_name] = time.perf_counter()
+
+
+def _format_breakdown(request, response, timer):
+    parts = []
+    for name, value in timer.breakdown().items():
+        parts.append(f"{name}={value:.1f}" if value is not None else f"{name}=-")
+    return f"{request.method} {request.url.path} {response.status_code} {response.http_version} " + " ".join(parts)
+
+
+def _attach_timer(request):
+    request.extensions["trace"] = CallTimer()
+
+def _log_timings(response):
+    timer = response.request.extensions.get("trace")
+    if isinstance(timer, CallTimer):
+        logger.info(f"Groq call timings: {_format_breakdown(response.request, response, timer)}")
+
+async def _attach_async_timer(request):
+    request.extensions["trace"] = AsyncCallTimer()
+
+async def _log_async_timings(response):
+    _log_timings(response)
+
+
+def _client_options():
+    import httpx
+    return {
+        "http2": http2_enabled(),
+        "limits": httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE,
+                               keepalive_expiry=KEEPALIVE_EXPIRY),
+        "timeout": httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+    }
+
+
+# Shared HTTP client for the sync Groq client, with per-call latency breakdown logging
+def build_http_client():
+    import httpx
+    hooks = {"request": [_attach_timer], "response": [_log_timings]} if LOG_TIMINGS else {}
+    return httpx.Client(event_hooks=hooks, **_client_options())
+
+def build_async_http_client():
+    import httpx
+    hooks = {"request": [_attach_async_timer], "response": [_log_async_timings]} if LOG_TIMINGS else {}
+    return httpx.AsyncClient(event_hooks=hooks, **_client_options())
+
+
+def _ping(client, api_key):
+    import httpx
+    try:
+        client.get(f"{BASE_URL}{PING_PATH}", headers={"Authorization": f"Bearer {api_key}"})
+    except httpx.HTTPError as e:
+        logger.warning(f"Groq keep-alive ping failed: {e}")
+
+
+# Open connections ahead of the first guest message so it doesn't pay DNS, TCP and TLS setup
+def prewarm(client, api_key, connections=PREWARM_CONNECTIONS):
+    host = urlparse(BASE_URL).hostname
+    start = time.perf_counter()
+    try:
+        socket.getaddrinfo(host, 443)
+        logger.info(f"Resolved {host} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except OSError as e:
+        logger.warning(f"Could not resolve {host}: {e}")
+    threads = [threading.Thread(target=_ping, args=(client, api_key)) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+# Prewarm, then ping periodically so idle connections are not dropped between guests.
+# `get_client` is called in the background thread, so building the client (and importing
+# httpx) does not delay startup.
+def start_keepalive(get_client, api_key, interval=KEEPALIVE_INTERVAL):
+    def run():
+        client = get_client()
+        prewarm(client, api_key)
+        while interval > 0:
+            time.sleep(interval)
+            _ping(client, api_key)
+
+    thread = threading.Thread(target=run, name="groq-keepalive", daemon=True)
+    thread.start()
+    return thread
+
+
+async def _ping_async(client, api_key):
+    import httpx
+    try:
+        await client.get(f"{BASE_URL}{PING_PATH}", headers={"Authorization": f"Bearer {api_key}"})
+    except httpx.HTTPError as e:
+        logger.warning(f"Groq keep-alive ping failed: {e}")
+
+async def keepalive_async(get_client, api_key, interval=KEEPALIVE_INTERVAL, connections=PREWARM_CONNECTIONS):
+    import asyncio
+    client = await asyncio.to_thread(get_client)
+    await asyncio.gather(*(_ping_async(client, api_key) for _ in range(connections)))
+    while interval > 0:
+        await asyncio.sleep(interval)
+        await _ping_async(client, api_key)
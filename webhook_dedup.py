@@ -0,0 +1,194 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+MEMORY_ENTRIES = int(os.getenv("WEBHOOK_DEDUP_SIZE", "10000"))
+DB_PATH = os.getenv("WEBHOOK_DEDUP_DB", "webhook_dedup.db")
+TTL = float(os.getenv("WEBHOOK_DEDUP_TTL", str(24 * 3600)))
+WAIT_TIMEOUT = float(os.getenv("WEBHOOK_DEDUP_WAIT", "30"))
+PRUNE_EVERY = 500
+
+
+class InFlight:
+    __slots__ = ("event", "result", "futures")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        # (loop, future) of the retries awaiting this delivery in run_async
+        self.futures = []
+
+    # Wake every retry waiting for this delivery, threaded or async
+    def finish(self):
+        self.event.set()
+        for loop, future in self.futures:
+            loop.call_soon_threadsafe(_resolve, future)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(True)
+
+
+# Makes webhook handling idempotent per Twilio MessageSid. The first delivery computes the
+# reply; retries that arrive meanwhile wait for it (single-flight) and later retries get the
+# stored reply back. Finished replies live in a bounded LRU and in SQLite, so they survive
+# eviction and are shared between worker processes.
+class WebhookDeduplicator:
+    def __init__(self, db_path=DB_PATH, max_entries=MEMORY_ENTRIES, ttl=TTL, wait_timeout=WAIT_TIMEOUT):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._done = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        self._stats = {"computed": 0, "memory_hits": 0, "db_hits": 0, "waited": 0}
+
+    def run(self, key, compute):
+        if not key:
+            return compute()
+
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._done[key]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = InFlight()
+
+        if not leader:
+            self._count("waited")
+            logger.info(f"Duplicate webhook {key} waiting for the first delivery")
+            if flight.event.wait(self.wait_timeout) and flight.result is not None:
+                return flight.result
+            return compute()
+
+        try:
+            result = self._load(key)
+            if result is not None:
+                self._count("db_hits")
+            else:
+                result = compute()
+                self._count("computed")
+                self._store(key, result)
+            self._remember(key, flight, result)
+            return result
+        finally:
+            self._land(key, flight)
+
+    # run() for the ASGI app: `compute` is a coroutine function and retries await the
+    # first delivery on their event loop instead of blocking a thread
+    async def run_async(self, key, compute):
+        import asyncio  # imported here so the Flask apps don't load it at startup
+        if not key:
+            return await compute()
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._done[key]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = InFlight()
+            else:
+                future = loop.create_future()
+                flight.futures.append((loop, future))
+
+        if not leader:
+            self._count("waited")
+            logger.info(f"Duplicate webhook {key} waiting for the first delivery")
+            try:
+                await asyncio.wait_for(future, self.wait_timeout)
+            except asyncio.TimeoutError:
+                pass
+            if flight.result is not None:
+                return flight.result
+            return await compute()
+
+        try:
+            result = await asyncio.to_thread(self._load, key)
+            if result is not None:
+                self._count("db_hits")
+            else:
+                result = await compute()
+                self._count("computed")
+                await asyncio.to_thread(self._store, key, result)
+            self._remember(key, flight, result)
+            return result
+        finally:
+            self._land(key, flight)
+
+    def _remember(self, key, flight, result):
+        flight.result = result
+        with self._lock:
+            self._done[key] = result
+            while len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+
+    # Retries only join a flight while it is registered, so none can miss finish()
+    def _land(self, key, flight):
+        with self._lock:
+            self._inflight.pop(key, None)
+        flight.finish()
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""CREATE TABLE IF NOT EXISTS webhook_replies (
+                message_sid TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )""")
+        return self._db
+
+    def _load(self, key):
+        try:
+            with self._db_lock:
+                row = self._connection().execute(
+                    "SELECT response FROM webhook_replies WHERE message_sid = ? AND created_at > ?",
+                    (key, time.time() - self.ttl)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Webhook dedup lookup failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def _store(self, key, result):
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO webhook_replies VALUES (?, ?, ?)",
+                                 (key, result, time.time()))
+                    self._writes += 1
+                    if self._writes % PRUNE_EVERY == 0:
+                        conn.execute("DELETE FROM webhook_replies WHERE created_at <= ?",
+                                     (time.time() - self.ttl,))
+        except sqlite3.Error as e:
+            logger.warning(f"Webhook dedup store failed: {e}")
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._inflight)
+            stats["memory_entries"] = len(self._done)
+        return stats
@@ -0,0 +1,110 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# "inline" answers inside the webhook (TwiML); "async" acknowledges and replies via the REST API
+REPLY_MODE = os.getenv("WHATSAPP_REPLY_MODE", "inline")
+WORKERS = int(os.getenv("WHATSAPP_DELIVERY_WORKERS", "8"))
+QUEUE_SIZE = int(os.getenv("WHATSAPP_DELIVERY_QUEUE_SIZE", "1000"))
+# "twilio" sends through the REST API; "fake" only records replies (benchmarks, local runs)
+SENDER = os.getenv("WHATSAPP_SENDER", "twilio")
+
+
+# Sends messages through the Twilio REST Messages API
+class TwilioSender:
+    def __init__(self, account_sid=None, auth_token=None):
+        self.account_sid = account_sid or os.getenv("TWILIO_ACCOUNT_SID")
+        self.auth_token = auth_token or os.getenv("TWILIO_AUTH_TOKEN")
+        self._client = None
+
+    def send(self, to, body, from_):
+        if self._client is None:
+            from twilio.rest import Client
+            self._client = Client(self.account_sid, self.auth_token)
+        self._client.messages.create(to=to, from_=from_, body=body)
+
+
+# Drop-in replacement for TwilioSender that records messages instead of sending them
+class FakeSender:
+    def __init__(self):
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, to, body, from_):
+        with self._lock:
+            self.sent.append({"to": to, "from": from_, "body": body})
+
+
+class ReplyJob:
+    __slots__ = ("phone_number", "message_body", "reply_from", "received_at")
+
+    def __init__(self, phone_number, message_body, reply_from):
+        self.phone_number = phone_number
+        self.message_body = message_body
+        self.reply_from = reply_from
+        self.received_at = time.monotonic()
+
+
+# Job queue plus worker pool that generates answers and delivers them out of band;
+# `answer` is called with the message body and the sender's phone number
+class DeliveryQueue:
+    def __init__(self, answer, sender=None, workers=WORKERS, maxsize=QUEUE_SIZE):
+        self.answer = answer
+        self.sender = sender or (FakeSender() if SENDER == "fake" else TwilioSender())
+        self.workers = workers
+        self._jobs = queue.Queue(maxsize=maxsize)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "rejected": 0, "delivered": 0, "failed": 0}
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"whatsapp-delivery-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    # Returns False when the queue is full so the caller can answer inline instead
+    def submit(self, phone_number, message_body, reply_from):
+        self.start()
+        try:
+            self._jobs.put_nowait(ReplyJob(phone_number, message_body, reply_from))
+        except queue.Full:
+            self._count("rejected")
+            return False
+        self._count("queued")
+        return True
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                reply = self.answer(job.message_body, job.phone_number)
+                self.sender.send(to=job.phone_number, body=reply, from_=job.reply_from)
+                self._count("delivered")
+                logger.info(f"Replied to {job.phone_number} in {time.monotonic() - job.received_at:.2f}s")
+            except Exception:
+                self._count("failed")
+                logger.exception(f"Failed to deliver reply to {job.phone_number}")
+            finally:
+                self._jobs.task_done()
+
+    # Block until every queued job has been handled (used by tests and benchmarks)
+    def drain(self):
+        self._jobs.join()
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._jobs.qsize()
+        return stats